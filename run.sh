@@ -1,23 +1,40 @@
 #!/bin/bash
+#
+# 사용법:
+#   ./run.sh                         메뉴에서 선택 (대화형)
+#   ./run.sh --mode updated          인자를 src/main.py에 그대로 전달 (cron/daemon용, 메뉴 없음)
+#   SKIP_INSTALL=1 ./run.sh ...      가상환경 생성/패키지 설치 없이 현재 Python으로 실행
 
-# 가상환경이 없다면 생성
-if [ ! -d "venv" ]; then
-    echo "Creating virtual environment..."
-    python3 -m venv venv
-fi
+cd "$(dirname "$0")"
+
+if [ "$SKIP_INSTALL" != "1" ]; then
+    # 가상환경이 없다면 생성
+    if [ ! -d "venv" ]; then
+        echo "Creating virtual environment..."
+        python3 -m venv venv
+    fi
+
+    # 가상환경 활성화
+    source venv/bin/activate
 
-# 가상환경 활성화
-source venv/bin/activate
+    # requirements.txt가 바뀐 경우에만 패키지 설치
+    if ! cmp -s requirements.txt venv/.installed-requirements.txt; then
+        pip install -r requirements.txt && cp requirements.txt venv/.installed-requirements.txt
+    fi
+fi
 
-# 필요한 패키지 설치
-pip install -r requirements.txt
+# 인자가 있으면 메뉴 없이 바로 실행
+if [ $# -gt 0 ]; then
+    exec python src/main.py "$@"
+fi
 
 # 실행 모드 선택
 echo "Tableau 데이터 원본 마이그레이션 도구"
 echo "1. 전체 데이터 원본 마이그레이션"
 echo "2. 업데이트된 데이터 원본만 마이그레이션"
 echo "3. Tableau Cloud 프로젝트 설정"
-echo "선택하세요 (1, 2 또는 3): "
+echo "4. 마이그레이션 계획 확인 (데이터 전송 없음)"
+echo "선택하세요 (1, 2, 3 또는 4): "
 read choice
 
 case $choice in
@@ -53,11 +70,16 @@ case $choice in
         exit 1
     fi
     ;;
+  4)
+    python src/main.py --mode plan
+    ;;
   *)
-    echo "잘못된 선택입니다. 1, 2 또는 3을 선택하세요."
+    echo "잘못된 선택입니다. 1, 2, 3 또는 4를 선택하세요."
     exit 1
     ;;
 esac
 
 # 가상환경 비활성화
-deactivate
\ No newline at end of file
+if [ "$SKIP_INSTALL" != "1" ]; then
+    deactivate
+fi
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""모의 Tableau 서버를 이용한 마이그레이션 벤치마크
+
+각 데이터 원본 수(기본 10/100/1000)에 대해 'all'과 'updated' 모드를 실행하고
+소요 시간, 요청 수, 전송 바이트를 표로 출력합니다.
+
+    python src/benchmark.py --sizes 10 100 --workers 4 --latency 0.01
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+
+from mock_server import MockTableauServer
+
+MODES = {
+    'all': 'migrate_all_datasources',
+    'updated': 'migrate_updated_datasources',
+}
+
+
+def _configure_environment(url, mock, workdir, args):
+    """TableauMigrationWorker의 Config가 모의 서버를 바라보도록 환경 변수 설정"""
+    os.environ.update({
+        'TS_SERVER': url, 'TS_SITE': 'source', 'TS_PAT_NAME': 'bench', 'TS_PAT_SECRET': 'bench',
+        'TC_SERVER': url, 'TC_SITE': 'target', 'TC_PAT_NAME': 'bench', 'TC_PAT_SECRET': 'bench',
+        'TC_PROJECT_ID': mock.target_project_id,
+        'UPDATE_CRITERIA_TYPE': 'days', 'UPDATE_CRITERIA_VALUE': '1',
+        'DOWNLOAD_WORKERS': str(args.download_workers or args.workers),
+        'UPLOAD_WORKERS': str(args.upload_workers or args.workers),
+        'PAGE_SIZE': str(args.page_size),
+        'TRANSFER_MODE': args.transfer_mode,
+        'STATE_DB_PATH': os.path.join(workdir, 'migration_state.db'),
+        'PROJECT_CACHE_TTL_SECONDS': '0',
+    })
+
+
+def run_scenario(size, mode, args):
+    """데이터 원본 size개, mode 한 번 실행 후 측정값 반환"""
+    # main은 Config 생성 시 환경 변수를 읽으므로 환경 설정 후에 가져옴
+    from main import TableauMigrationWorker
+
+    mock = MockTableauServer(
+        datasource_count=size,
+        file_size=args.file_size_kb * 1024,
+        file_size_jitter=args.file_size_jitter,
+        latency=args.latency,
+        bandwidth=args.bandwidth_mbps * 1024 * 1024 if args.bandwidth_mbps else None,
+        max_page_size=args.max_page_size,
+        failure_rate=args.failure_rate,
+        throttle_rate=args.throttle_rate,
+        updated_ratio=args.updated_ratio
+    )
+    with mock, tempfile.TemporaryDirectory() as workdir:
+        _configure_environment(mock.url, mock, workdir, args)
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            worker = TableauMigrationWorker()
+            started = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                    getattr(worker, MODES[mode])()
+            finally:
+                worker.close()
+            elapsed = time.perf_counter() - started
+        finally:
+            os.chdir(cwd)
+
+        stats = mock.stats
+        return {
+            'datasources': size,
+            'mode': mode,
+            'wall_time': round(elapsed, 3),
+            'requests': stats['requests'],
+            'sign_ins': stats['sign_ins'],
+            'publishes': stats['publishes'],
+            'bytes_downloaded': stats['bytes_downloaded'],
+            'bytes_uploaded': stats['bytes_uploaded'],
+            'failures': stats['failures'] + stats['throttled'],
+        }
+
+
+def print_report(results):
+    print(f"{'데이터 원본':>10} {'모드':<8} {'소요(초)':>10} {'요청 수':>8} {'로그인':>6} "
+          f"{'게시':>6} {'다운로드(MB)':>12} {'업로드(MB)':>10} {'오류 응답':>8}")
+    print("-" * 92)
+    for r in results:
+        print(f"{r['datasources']:>10} {r['mode']:<8} {r['wall_time']:>10.2f} {r['requests']:>8} "
+              f"{r['sign_ins']:>6} {r['publishes']:>6} {r['bytes_downloaded'] / 1024 / 1024:>12.1f} "
+              f"{r['bytes_uploaded'] / 1024 / 1024:>10.1f} {r['failures']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='모의 서버 기반 마이그레이션 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='데이터 원본 수 목록')
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--workers', type=int, default=1, help='다운로드/업로드 동시 작업 수')
+    parser.add_argument('--download-workers', type=int)
+    parser.add_argument('--upload-workers', type=int)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--transfer-mode', choices=['file', 'stream'], default='file')
+    parser.add_argument('--file-size-kb', type=int, default=256, help='합성 데이터 원본 파일 크기 (KB)')
+    parser.add_argument('--file-size-jitter', type=float, default=0.0, help='파일 크기 변동 비율')
+    parser.add_argument('--latency', type=float, default=0.0, help='요청별 지연 시간 (초)')
+    parser.add_argument('--bandwidth-mbps', type=float, help='전송 속도 제한 (MB/s)')
+    parser.add_argument('--max-page-size', type=int, default=1000)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--updated-ratio', type=float, default=0.1, help='최근 수정된 데이터 원본 비율')
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.ERROR)
+
+    results = []
+    for size in args.sizes:
+        for mode in args.modes:
+            result = run_scenario(size, mode, args)
+            results.append(result)
+            print(f"데이터 원본 {size}개 / {mode}: {result['wall_time']:.2f}초", flush=True)
+
+    print()
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,174 @@
+import logging
+import os
+import time
+
+from tableauserverclient.server.request_factory import RequestFactory
+
+import metrics
+from content_types import BYTES_PER_MB, CONTENT_TYPES
+from session_pool import is_auth_error
+
+
+def is_missing_upload_session(error):
+    """업로드 세션이 만료되었거나 서버에 없는 경우(404) 여부"""
+    return str(getattr(error, 'code', '')).startswith('404')
+
+
+class ChunkedPublisher:
+    """Tableau 파일 업로드 세션 API를 직접 사용하는 청크 단위 게시
+
+    - chunk_size 단위로 append하며, 실패한 청크만 chunk_retries번까지 다시 보냅니다.
+    - state가 있으면 청크마다 전송 완료 바이트 수를 저장하므로, 중단된 업로드를 같은 내용(지문)의
+      파일로 다시 시도할 때 남은 부분부터 이어서 보냅니다.
+    - 청크마다 전송 시간과 처리량을 로그로 남깁니다.
+    """
+
+    def __init__(self, chunk_size=50 * BYTES_PER_MB, chunk_retries=3, retry_delay=2, state=None, policy=None):
+        self.chunk_size = chunk_size
+        self.chunk_retries = chunk_retries
+        self.retry_delay = retry_delay
+        self.state = state
+        self.policy = policy
+        self.logger = logging.getLogger(__name__)
+
+    def _start_session(self, server, file_path, resume_key, fingerprint):
+        """저장된 업로드 세션을 이어받거나 새 세션을 시작
+
+        파일 전체가 이미 전송된 세션은 이어받지 않습니다. 마지막 청크와 게시 사이에 중단되었거나 게시가 실패한
+        경우로, 서버가 세션을 이미 정리했을 수 있는데 append 없이 게시만 보내면 만료 여부를 확인할 수 없습니다.
+        """
+        if self.state and resume_key:
+            saved = self.state.upload_session(resume_key)
+            if saved and fingerprint and saved['fingerprint'] == fingerprint \
+                    and saved['committed_bytes'] < os.path.getsize(file_path):
+                self.logger.info(
+                    f"Resuming upload session {saved['upload_id']} at "
+                    f"{saved['committed_bytes'] / BYTES_PER_MB:.1f} MB"
+                )
+                return saved['upload_id'], saved['committed_bytes']
+
+        upload_id = server.fileuploads.initiate()
+        if self.state and resume_key:
+            self.state.save_upload_session(resume_key, upload_id, 0, fingerprint)
+        return upload_id, 0
+
+    def _send_chunk(self, server, upload_id, chunk):
+        request, content_type = RequestFactory.Fileupload.chunk_req(chunk)
+        with metrics.CHUNK_UPLOAD_SECONDS.time():
+            server.fileuploads.append(upload_id, request, content_type)
+
+    def append_chunk(self, server, upload_id, chunk, label):
+        """청크 한 개 전송 - 인증 오류는 세션 풀의 재로그인에 맡기고 그 밖의 오류는 재시도
+
+        policy(RequestPolicy)가 있으면 일시적인 오류만 Retry-After/백오프 규칙에 따라 재시도합니다.
+        """
+        if self.policy is not None:
+            self.policy.call('upload_chunk', lambda: self._send_chunk(server, upload_id, chunk),
+                             max_retries=self.chunk_retries)
+            return
+
+        for attempt in range(self.chunk_retries + 1):
+            try:
+                self._send_chunk(server, upload_id, chunk)
+                return
+            except Exception as e:
+                if is_auth_error(e) or is_missing_upload_session(e) or attempt == self.chunk_retries:
+                    raise
+                delay = self.retry_delay * (2 ** attempt)
+                metrics.RETRIES.labels('upload_chunk').inc()
+                self.logger.warning(
+                    f"Chunk upload for {label} failed (attempt {attempt + 1}/{self.chunk_retries + 1}), "
+                    f"retrying in {delay}s: {str(e)}"
+                )
+                time.sleep(delay)
+
+    def upload(self, server, file_path, resume_key=None, fingerprint=None, label=None):
+        """파일을 청크 단위로 업로드하고 업로드 세션 ID를 반환"""
+        label = label or os.path.basename(file_path)
+        file_size = os.path.getsize(file_path)
+        upload_id, offset = self._start_session(server, file_path, resume_key, fingerprint)
+
+        try:
+            self._upload_from(server, upload_id, file_path, offset, file_size, resume_key, fingerprint, label)
+        except Exception as e:
+            if not is_missing_upload_session(e) or offset == 0:
+                raise
+            # 이어받은 세션이 서버에서 만료된 경우 처음부터 다시 업로드
+            self.logger.warning(f"Upload session {upload_id} expired, restarting upload of {label}")
+            if self.state and resume_key:
+                self.state.clear_upload_session(resume_key)
+            upload_id, offset = self._start_session(server, file_path, resume_key, fingerprint)
+            self._upload_from(server, upload_id, file_path, offset, file_size, resume_key, fingerprint, label)
+        return upload_id
+
+    def _upload_from(self, server, upload_id, file_path, offset, file_size, resume_key, fingerprint, label):
+        chunk_number = offset // self.chunk_size
+        with open(file_path, 'rb') as f:
+            f.seek(offset)
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                chunk_number += 1
+                started = time.monotonic()
+                self.append_chunk(server, upload_id, chunk, label)
+                elapsed = max(time.monotonic() - started, 1e-6)
+                offset += len(chunk)
+                if self.state and resume_key:
+                    self.state.save_upload_session(resume_key, upload_id, offset, fingerprint)
+
+                self.logger.info(
+                    f"Uploaded chunk {chunk_number} of {label}: {len(chunk) / BYTES_PER_MB:.1f} MB in "
+                    f"{elapsed:.2f}s ({len(chunk) / BYTES_PER_MB / elapsed:.1f} MB/s), "
+                    f"{offset / BYTES_PER_MB:.1f}/{file_size / BYTES_PER_MB:.1f} MB"
+                )
+
+    def commit(self, server, content_type, item, upload_id, file_extension, mode='Overwrite'):
+        """업로드 세션의 파일로 콘텐츠 게시를 완료하고 게시된 항목을 반환"""
+        spec = CONTENT_TYPES[content_type]
+        endpoint = getattr(server, spec.endpoint)
+        url = (f"{endpoint.baseurl}?{spec.type_param}={file_extension}&{mode.lower()}=true"
+               f"&uploadSessionId={upload_id}")
+        xml_request, request_content_type = spec.request_factory.publish_req_chunked(item)
+        response = endpoint.post_request(url, xml_request, request_content_type)
+        return spec.item_class.from_response(response.content, server.namespace)[0]
+
+    def _keeps_session(self, error):
+        """게시 실패 후에도 업로드 세션을 다시 사용할 수 있는 오류(인증 만료, 일시적인 오류) 여부"""
+        if is_auth_error(error):
+            return True
+        if self.policy is not None:
+            return self.policy.is_retryable(error)
+        code = str(getattr(error, 'code', ''))
+        return code.startswith('429') or code.startswith('5')
+
+    def _clear_session(self, resume_key):
+        if self.state and resume_key:
+            self.state.clear_upload_session(resume_key)
+
+    def publish(self, server, content_type, item, file_path, mode='Overwrite',
+                resume_key=None, fingerprint=None):
+        """파일을 청크 단위로 업로드한 뒤 게시
+
+        게시 요청이 업로드 세션을 찾지 못하면(404) 저장된 세션을 지우고 새 세션으로 처음부터 다시 업로드합니다.
+        그 밖에 재시도해도 성공하지 않을 오류로 게시가 실패하면 저장된 세션을 지워 다음 시도는 새 세션을 사용합니다.
+        """
+        file_extension = os.path.splitext(file_path)[1][1:]
+        upload_id = self.upload(server, file_path, resume_key, fingerprint, label=item.name)
+        try:
+            try:
+                published = self.commit(server, content_type, item, upload_id, file_extension, mode)
+            except Exception as e:
+                if not is_missing_upload_session(e):
+                    raise
+                self.logger.warning(f"Upload session {upload_id} expired before publishing, "
+                                    f"restarting upload of {item.name}")
+                self._clear_session(resume_key)
+                upload_id = self.upload(server, file_path, resume_key, fingerprint, label=item.name)
+                published = self.commit(server, content_type, item, upload_id, file_extension, mode)
+        except Exception as e:
+            if not self._keeps_session(e):
+                self._clear_session(resume_key)
+            raise
+        self._clear_session(resume_key)
+        return published
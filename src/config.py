@@ -1,3 +1,4 @@
+import copy
 import os
 from dotenv import load_dotenv
 import tableauserverclient as TSC
@@ -6,6 +7,10 @@ class Config:
     def __init__(self):
         load_dotenv('properties.env')
         
+        # 사이트 매핑 실행 시 원본 사이트 이름과 프로젝트 매핑 (for_site 참고)
+        self.site_name = None
+        self.project_mappings = None
+
         # Tableau Server 설정
         self.server = {
             'url': os.getenv('TS_SERVER'),
@@ -29,6 +34,101 @@ class Config:
             'type': os.getenv('UPDATE_CRITERIA_TYPE', 'days')
         }
 
+        # 동시 실행 설정
+        self.migration = {
+            'download_workers': int(os.getenv('DOWNLOAD_WORKERS', 1)),
+            'upload_workers': int(os.getenv('UPLOAD_WORKERS', 1)),
+            'queue_size': int(os.getenv('PIPELINE_QUEUE_SIZE', 0)) or None,
+            'page_size': int(os.getenv('PAGE_SIZE', 100)),
+            'detail_workers': int(os.getenv('DETAIL_WORKERS', 4)),
+            # 마이그레이션할 콘텐츠 유형 (datasource, workbook, flow 중 쉼표로 구분)
+            'content_types': os.getenv('CONTENT_TYPES', 'datasource'),
+            # 마이그레이션 상태 저장소 (properties.env 옆에 생성)
+            'state_db': os.getenv('STATE_DB_PATH', 'migration_state.db'),
+            # Cloud 프로젝트 목록 캐시 (TTL 0이면 디스크에 저장하지 않음)
+            'project_cache_path': os.getenv('PROJECT_CACHE_PATH', '.project_cache.json'),
+            'project_cache_ttl': int(os.getenv('PROJECT_CACHE_TTL_SECONDS', 300)),
+            # 청크 업로드 설정 (임계값 이상 파일은 업로드 세션 API로 청크 단위 전송)
+            'upload_chunk_threshold_mb': int(os.getenv('UPLOAD_CHUNK_THRESHOLD_MB', 64)),
+            'upload_chunk_size_mb': int(os.getenv('UPLOAD_CHUNK_SIZE_MB', 50)),
+            'upload_chunk_retries': int(os.getenv('UPLOAD_CHUNK_RETRIES', 3)),
+            # 내용이 마지막 게시와 같아도 다시 게시 (지문 비교 생략)
+            'force_republish': os.getenv('FORCE_REPUBLISH', 'false').lower() == 'true',
+            # 실행별 JSON/CSV 리포트 저장 폴더 (빈 값이면 저장하지 않음)
+            'report_dir': os.getenv('REPORT_DIR', 'reports'),
+            # 전송 방식 - file: 다운로드 폴더를 거쳐 게시, stream: 다운로드 응답을 업로드 세션으로 바로 전송
+            'transfer_mode': os.getenv('TRANSFER_MODE', 'file'),
+            'stream_buffer_chunks': int(os.getenv('STREAM_BUFFER_CHUNKS', 2)),
+            # 0이면 401 응답을 받을 때만 재로그인
+            'session_ttl_minutes': int(os.getenv('SESSION_TTL_MINUTES', 0)),
+            # 여러 사이트를 한 번에 마이그레이션할 때의 매핑 파일과 동시 처리 사이트 수
+            'site_mapping_path': os.getenv('SITE_MAPPING_PATH'),
+            'site_workers': int(os.getenv('SITE_WORKERS', 2))
+        }
+
+        # API 호출 재시도 설정 (429, 5xx, 연결 오류)
+        self.retry = {
+            'max_attempts': int(os.getenv('RETRY_MAX_ATTEMPTS', 4)),
+            'base_delay': float(os.getenv('RETRY_BASE_DELAY_SECONDS', 1)),
+            'max_delay': float(os.getenv('RETRY_MAX_DELAY_SECONDS', 60)),
+            # 실행당 작업별 재시도 예산 - RETRY_BUDGETS='download=50,publish=20' 형식으로 작업별 지정
+            'budget': int(os.getenv('RETRY_BUDGET', 100)),
+            'budgets': os.getenv('RETRY_BUDGETS', ''),
+            # 스로틀링 응답에 따라 동시 실행 수를 줄였다가 정상화되면 다시 늘림
+            'adaptive_concurrency': os.getenv('ADAPTIVE_CONCURRENCY', 'true').lower() == 'true'
+        }
+
+        # 마이그레이션 순서와 실행 마감 시각
+        self.schedule = {
+            # listed: 목록 순서, small-first: 작은 데이터 원본 먼저, largest-first: 큰 데이터 원본 먼저(전체 소요 시간 단축)
+            'order': os.getenv('SCHEDULE_ORDER', 'listed'),
+            # 우선순위 규칙 - PRIORITY_RULES='tag:critical=100,project:Finance/*=50,name:*KPI*=10' 형식
+            'priority_rules': os.getenv('PRIORITY_RULES', ''),
+            # 실행 시작 후 이 시간(분)이 지나면 아직 시작하지 않은 항목은 다음 실행으로 미룸 (0이면 제한 없음)
+            'deadline_minutes': float(os.getenv('RUN_DEADLINE_MINUTES', 0))
+        }
+
+        # daemon 모드 설정
+        self.daemon = {
+            # 간격('15m', '1h') 또는 5필드 cron 식('0 */4 * * *')
+            'schedule': os.getenv('DAEMON_SCHEDULE', '1h'),
+            # 회차마다 실행할 마이그레이션 (all 또는 updated)
+            'mode': os.getenv('DAEMON_RUN_MODE', 'updated'),
+            'run_on_start': os.getenv('DAEMON_RUN_ON_START', 'true').lower() == 'true',
+            # daemon과 cron/수동 실행이 겹치지 않도록 잡는 잠금 파일
+            'lock_path': os.getenv('RUN_LOCK_PATH', 'migration.lock')
+        }
+
+        # Prometheus 지표 설정 (포트가 0이면 HTTP로 노출하지 않음)
+        self.metrics = {
+            'port': int(os.getenv('METRICS_PORT', 0)),
+            # cron 실행용 - node_exporter textfile 수집기 디렉터리의 .prom 파일 경로
+            'textfile': os.getenv('METRICS_TEXTFILE')
+        }
+
+    def for_site(self, mapping):
+        """사이트 매핑 한 항목(site_mapping.SiteMapping)용 설정 사본
+
+        대상 프로젝트는 TC_PROJECT_ID 대신 프로젝트 매핑으로 정하며,
+        상태 저장소/프로젝트 캐시/리포트/다운로드 경로는 사이트별로 분리합니다.
+        """
+        site_config = copy.deepcopy(self)
+        site_config.site_name = mapping.source_site
+        site_config.project_mappings = mapping.projects
+
+        site_config.server['site'] = mapping.source_site
+        site_config.server.update({k: v for k, v in (mapping.source_auth or {}).items() if v})
+        site_config.cloud['site'] = mapping.target_site
+        site_config.cloud.update({k: v for k, v in (mapping.target_auth or {}).items() if v})
+        site_config.cloud['project_id'] = None
+
+        settings = site_config.migration
+        settings['state_db'] = _site_path(settings['state_db'], mapping.source_site)
+        settings['project_cache_path'] = _site_path(settings['project_cache_path'], mapping.target_site)
+        if settings['report_dir']:
+            settings['report_dir'] = os.path.join(settings['report_dir'], mapping.source_site)
+        return site_config
+
     def validate(self):
         """설정값 검증"""
         # Server 설정 검증
@@ -42,6 +142,15 @@ class Config:
                    self.cloud['project_id']]):
             raise ValueError("Required Tableau Cloud settings are missing in properties.env")
 
+
+def _site_path(path, site):
+    """파일 경로에 사이트 이름 추가 (migration_state.db -> migration_state.finance.db)"""
+    if not path:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{site or 'default'}{ext}"
+
+
 def get_project_id(project_name):
     config = Config()
     
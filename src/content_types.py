@@ -0,0 +1,63 @@
+"""마이그레이션할 수 있는 콘텐츠 유형
+
+데이터 원본, 통합 문서, 흐름은 같은 REST 패턴(목록/다운로드/업로드 세션 게시)을 사용하므로
+유형별로 엔드포인트와 게시 요청 생성기만 달리해 같은 파이프라인으로 처리합니다.
+목록 조회와 실행 순서는 ORDER를 따르며, 통합 문서와 흐름은 연결된 게시 데이터 원본보다 나중에 게시됩니다.
+"""
+from collections import namedtuple
+
+import tableauserverclient as TSC
+from tableauserverclient.server.request_factory import RequestFactory
+
+# endpoint: TSC.Server 엔드포인트 이름, type_param: 업로드 세션 게시의 파일 형식 파라미터,
+# include_extract: 다운로드에 includeExtract 파라미터 사용 여부, list_fields: 목록 응답에 함께 요청할 필드,
+# size_unit: 목록 응답 size 메타데이터 1단위의 바이트 수 (통합 문서의 size는 MB 단위)
+ContentType = namedtuple('ContentType', [
+    'name', 'endpoint', 'type_param', 'request_factory', 'item_class', 'default_extension',
+    'include_extract', 'list_fields', 'size_unit'
+])
+
+BYTES_PER_MB = 1024 * 1024
+
+CONTENT_TYPES = {
+    'datasource': ContentType('datasource', 'datasources', 'datasourceType', RequestFactory.Datasource,
+                              TSC.DatasourceItem, '.tdsx', True, {'_default_', 'size'}, 1),
+    'flow': ContentType('flow', 'flows', 'flowType', RequestFactory.Flow,
+                        TSC.FlowItem, '.tflx', False, {'_default_'}, 1),
+    'workbook': ContentType('workbook', 'workbooks', 'workbookType', RequestFactory.Workbook,
+                            TSC.WorkbookItem, '.twbx', True, {'_default_', 'size'}, BYTES_PER_MB),
+}
+
+# 목록 조회/실행 순서 - 게시 데이터 원본을 먼저 처리
+ORDER = ('datasource', 'flow', 'workbook')
+
+
+def parse_content_types(value):
+    """'datasource,workbook' 형식의 콘텐츠 유형 목록 파싱 (ORDER 순서로 정렬)"""
+    names = {name.strip().lower() for name in (value or '').split(',') if name.strip()}
+    unknown = names - set(CONTENT_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown content types: {', '.join(sorted(unknown))} "
+                         f"(expected {', '.join(ORDER)})")
+    return [name for name in ORDER if name in names] or ['datasource']
+
+
+def content_type_of(item):
+    """TSC 항목의 콘텐츠 유형 이름"""
+    for content_type in CONTENT_TYPES.values():
+        if isinstance(item, content_type.item_class):
+            return content_type.name
+    raise ValueError(f"Unsupported content item: {type(item).__name__}")
+
+
+def metadata_size(item):
+    """목록 응답의 size 메타데이터를 바이트로 변환 (없으면 None)"""
+    size = getattr(item, 'size', None)
+    if not size:
+        return None
+    return size * CONTENT_TYPES[content_type_of(item)].size_unit
+
+
+def new_item(content_type, project_id, name):
+    """게시 요청용 빈 항목"""
+    return CONTENT_TYPES[content_type].item_class(project_id=project_id, name=name)
@@ -0,0 +1,297 @@
+"""daemon 모드 - 프로세스 하나가 일정에 따라 마이그레이션을 반복 실행
+
+cron이 실행할 때마다 새 프로세스를 띄우는 대신, 워커(세션 풀, 프로젝트 캐시, 상태 저장소)를 유지한 채
+DAEMON_SCHEDULE에 따라 실행합니다.
+
+- 일정: 간격('30s', '15m', '1h', '1d', 단위가 없으면 초) 또는 5필드 cron 식('0 */4 * * *', 로컬 시각)
+- 중복 실행 방지: 실행마다 잠금 파일(RUN_LOCK_PATH)을 잡으며, cron이나 수동 실행이 이미 잡고 있으면 그 회차를 건너뜁니다.
+  실행이 다음 일정보다 오래 걸리면 지난 회차는 건너뛰고 다음 일정부터 실행합니다.
+- 상태 확인: /healthz(JSON, 마지막 실행이 실패했으면 503)와 /metrics(Prometheus)를 METRICS_PORT로 제공합니다.
+"""
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+import metrics
+from state_store import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\s*([smhd]?)$')
+INTERVAL_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# (이름, 최솟값, 최댓값) - 요일은 0과 7이 모두 일요일
+CRON_FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7))
+# 실행 시각을 찾을 최대 범위 (2월 30일처럼 존재하지 않는 날짜 방지)
+CRON_SEARCH_DAYS = 366 * 5
+
+
+class RunLocked(Exception):
+    """다른 프로세스가 마이그레이션을 실행 중"""
+
+
+class IntervalSchedule:
+    """고정 간격 일정 - 이전 실행 시작 시각부터 간격마다 실행"""
+
+    def __init__(self, seconds):
+        if seconds <= 0:
+            raise ValueError("Daemon interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, previous, now):
+        """previous(이전 실행 시작)에서 간격만큼 지난 시각 중 now 이후 첫 시각"""
+        if previous is None:
+            return now
+        step = timedelta(seconds=self.seconds)
+        upcoming = previous + step
+        while upcoming <= now:
+            upcoming += step
+        return upcoming
+
+    def __str__(self):
+        return f"every {self.seconds:g}s"
+
+
+def _parse_cron_field(text, name, low, high):
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/', 1)
+            step = int(step)
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            # '5/15'처럼 간격이 있는 단일 값은 최댓값까지의 범위
+            start = int(part)
+            end = high if step > 1 else start
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"Invalid cron {name} field: {text}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """5필드 cron 식 일정 (분 시 일 월 요일, 로컬 시각)
+
+    일과 요일이 모두 지정되면 cron과 같이 둘 중 하나만 맞아도 실행합니다.
+    """
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression must have 5 fields: {expression}")
+        self.expression = expression
+        parsed = [_parse_cron_field(text, *spec) for text, spec in zip(fields, CRON_FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        self.day_restricted = fields[2] != '*'
+        self.weekday_restricted = fields[4] != '*'
+
+    def _day_matches(self, moment):
+        # cron 요일은 일요일이 0, datetime.weekday()는 월요일이 0
+        weekday = (moment.weekday() + 1) % 7
+        if self.day_restricted and self.weekday_restricted:
+            return moment.day in self.days or weekday in self.weekdays
+        return moment.day in self.days and weekday in self.weekdays
+
+    def next_after(self, previous, now):
+        """now 이후 첫 실행 시각 (now와 같은 tzinfo)"""
+        local = now.astimezone() if now.tzinfo else now
+        moment = local.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=CRON_SEARCH_DAYS)
+        while moment < limit:
+            if moment.month not in self.months or not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.astimezone(now.tzinfo) if now.tzinfo else moment
+        raise ValueError(f"Cron expression never matches: {self.expression}")
+
+    def __str__(self):
+        return f"cron '{self.expression}'"
+
+
+def parse_schedule(value):
+    """DAEMON_SCHEDULE 값을 IntervalSchedule 또는 CronSchedule로 변환"""
+    value = (value or '').strip()
+    match = INTERVAL_PATTERN.match(value)
+    if match:
+        return IntervalSchedule(float(match.group(1)) * INTERVAL_UNITS[match.group(2)])
+    return CronSchedule(value)
+
+
+class RunLock:
+    """프로세스 간 실행 잠금 (flock) - daemon과 cron/수동 실행이 겹치지 않도록 사용
+
+    잠금 파일에는 잠금을 잡은 프로세스 ID를 기록합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.path, 'a+')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.seek(0)
+            owner = lock_file.read().strip() or 'unknown'
+            lock_file.close()
+            raise RunLocked(f"Another migration run holds {self.path} (pid {owner})")
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+
+    def release(self):
+        if self._file is None:
+            return
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class MigrationDaemon:
+    """일정에 따라 run_cycle()을 반복 실행
+
+    run_cycle은 실행이 성공하면 True를 반환합니다. 한 번에 한 회차만 실행하며,
+    stop()을 호출하면 진행 중인 회차가 끝난 뒤 종료합니다.
+    """
+
+    def __init__(self, run_cycle, schedule, lock=None, run_on_start=True, after_cycle=None):
+        self.run_cycle = run_cycle
+        self.schedule = schedule
+        self.lock = lock
+        self.run_on_start = run_on_start
+        self.after_cycle = after_cycle
+        self.started_at = datetime.now(timezone.utc)
+        self._stop = threading.Event()
+        self._status_lock = threading.Lock()
+        self._status = {
+            'state': 'idle',
+            'cycles': 0,
+            'consecutive_failures': 0,
+            'last_status': None,
+            'last_started_at': None,
+            'last_finished_at': None,
+            'next_run_at': None
+        }
+
+    def status(self):
+        with self._status_lock:
+            status = dict(self._status)
+        status['started_at'] = self.started_at
+        status['schedule'] = str(self.schedule)
+        return {key: to_timestamp(value) if isinstance(value, datetime) else value
+                for key, value in status.items()}
+
+    def healthy(self):
+        with self._status_lock:
+            return self._status['last_status'] != 'failed'
+
+    def _set_status(self, **fields):
+        with self._status_lock:
+            self._status.update(fields)
+
+    def stop(self):
+        self._stop.set()
+
+    def run_forever(self):
+        logger.info(f"Migration daemon started ({self.schedule})")
+        now = datetime.now(timezone.utc)
+        next_run = now if self.run_on_start else self.schedule.next_after(now, now)
+        while not self._stop.is_set():
+            self._set_status(state='idle', next_run_at=next_run)
+            metrics.DAEMON_NEXT_RUN.set(next_run.timestamp())
+            wait = (next_run - datetime.now(timezone.utc)).total_seconds()
+            if wait > 0 and self._stop.wait(wait):
+                break
+
+            started = datetime.now(timezone.utc)
+            self._cycle(started)
+            next_run = self.schedule.next_after(started, datetime.now(timezone.utc))
+        logger.info("Migration daemon stopped")
+
+    def _cycle(self, started):
+        try:
+            if self.lock is not None:
+                self.lock.acquire()
+        except RunLocked as e:
+            logger.warning(f"Skipping scheduled run: {str(e)}")
+            metrics.DAEMON_SKIPPED_RUNS.inc()
+            return
+
+        self._set_status(state='running', last_started_at=started)
+        try:
+            succeeded = self.run_cycle()
+        except Exception as e:
+            logger.error(f"Scheduled run failed: {str(e)}")
+            succeeded = False
+        finally:
+            if self.lock is not None:
+                self.lock.release()
+
+        with self._status_lock:
+            self._status['cycles'] += 1
+            self._status['last_status'] = 'completed' if succeeded else 'failed'
+            self._status['last_finished_at'] = datetime.now(timezone.utc)
+            self._status['consecutive_failures'] = 0 if succeeded else self._status['consecutive_failures'] + 1
+        if self.after_cycle:
+            self.after_cycle()
+
+
+def start_health_server(daemon, port, addr='0.0.0.0'):
+    """/healthz와 /metrics를 제공하는 HTTP 서버를 백그라운드 스레드로 시작"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if path == '/metrics':
+                self._send(200, CONTENT_TYPE_LATEST, generate_latest(metrics.REGISTRY))
+            elif path in ('/healthz', '/health'):
+                body = json.dumps(daemon.status()).encode('utf-8')
+                self._send(200 if daemon.healthy() else 503, 'application/json', body)
+            else:
+                self._send(404, 'text/plain', b'not found')
+
+        def _send(self, code, content_type, body):
+            self.send_response(code)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 상태 확인 요청은 실행 로그에 남기지 않음
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    thread = threading.Thread(target=server.serve_forever, name='health', daemon=True)
+    thread.start()
+    logger.info(f"Serving /healthz and /metrics on {addr}:{port}")
+    return server
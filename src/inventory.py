@@ -0,0 +1,86 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import tableauserverclient as TSC
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def is_rejected_request(error):
+    """서버가 요청 옵션(필드/필터)을 지원하지 않아 거부한 경우(400) 여부"""
+    return str(getattr(error, 'code', '')).startswith('400')
+
+
+def iter_all_pages(pool, endpoint, page_size=100, options_factory=None, on_total=None,
+                   fallback_factory=None, on_fallback=None):
+    """목록 API의 모든 페이지를 차례로 조회하며 항목을 하나씩 반환하는 제너레이터
+
+    페이지는 소비되는 만큼만 조회되므로, 앞쪽 항목 처리가 뒤쪽 페이지 조회와 겹쳐서 진행됩니다.
+    페이지마다 세션 풀에서 연결을 잠시 빌려 쓰고 곧바로 반납합니다.
+
+    Args:
+        pool: TableauSessionPool
+        endpoint: TSC.Server의 엔드포인트 이름 (예: 'datasources', 'projects')
+        page_size: 페이지당 항목 수
+        options_factory: (page_number, page_size) -> TSC.RequestOptions, 필터/필드 지정용
+        on_total: 첫 페이지 조회 후 전체 항목 수를 받는 콜백
+        fallback_factory: 첫 페이지 요청이 400으로 거부될 때 대신 사용할 options_factory
+        on_fallback: fallback_factory로 전환될 때 호출되는 콜백
+    """
+    page_number = 1
+    fetched = 0
+    while True:
+        if options_factory:
+            options = options_factory(page_number, page_size)
+        else:
+            options = TSC.RequestOptions(pagenumber=page_number, pagesize=page_size)
+
+        try:
+            with metrics.LIST_PAGE_SECONDS.labels(endpoint).time():
+                items, pagination = pool.run(lambda server: getattr(server, endpoint).get(options),
+                                             operation='list')
+        except Exception as e:
+            if page_number != 1 or fallback_factory is None or not is_rejected_request(e):
+                raise
+            logger.warning(f"Server rejected {endpoint} query options, retrying without them: {str(e)}")
+            metrics.RETRIES.labels(f"{endpoint}_list_fallback").inc()
+            options_factory, fallback_factory = fallback_factory, None
+            if on_fallback:
+                on_fallback()
+            continue
+
+        total = pagination.total_available
+        if page_number == 1 and on_total:
+            on_total(total)
+
+        yield from items
+
+        fetched += len(items)
+        if not items or total is None or fetched >= total:
+            return
+        page_number += 1
+
+
+def hydrate(items, is_complete, fetch_detail, workers=4):
+    """필요한 필드가 빠진 항목만 상세 조회로 채워서 반환하는 제너레이터
+
+    목록 응답에 필드가 모두 있는 항목은 그대로 통과시키고, 빠진 항목만 최대 workers개씩
+    동시에 상세 조회합니다. 상세 조회가 끝나는 순서대로 반환하므로 순서는 보장하지 않습니다.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='detail') as executor:
+        pending = set()
+        for item in items:
+            if is_complete(item):
+                yield item
+                continue
+
+            pending.add(executor.submit(fetch_detail, item))
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        for future in pending:
+            yield future.result()
@@ -1,178 +1,774 @@
 from config import Config
+from pipeline import MigrationPipeline
+from session_pool import TableauSessionPool, is_auth_error
+from retry_policy import RequestPolicy, AdaptiveLimiter, parse_budgets
+from inventory import iter_all_pages, hydrate
+from state_store import MigrationStateStore
+from transfer import download_with_fingerprint, stream_to_upload_session, StreamedUpload, StreamingNotPossible
+from project_cache import ProjectCache
+from site_mapping import ProjectMapper, load_site_mappings
+from multi_site import MultiSiteMigration
+from chunked_upload import ChunkedPublisher, BYTES_PER_MB
+from results import MigrationResults, RECONNECT_REASON
+from planner import MigrationPlan, throughput
+from scheduler import MigrationScheduler, DependencyGate, parse_priority_rules, run_deadline
+from content_types import CONTENT_TYPES, content_type_of, metadata_size, new_item, parse_content_types
+from daemon import MigrationDaemon, RunLock, RunLocked, parse_schedule, start_health_server
+import metrics
 import tableauserverclient as TSC
 import logging
 import os
-from datetime import datetime
-from contextlib import contextmanager
-from prometheus_client import Summary, Counter
+from datetime import datetime, timedelta, timezone
 from tqdm import tqdm
 from typing import List, Dict
 import argparse
+import signal
+import sys
+import threading
+import time
 
 class TableauMigrationWorker:
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, config=None):
+        # 사이트 매핑 실행에서는 Config.for_site로 만든 사이트별 설정을 받음
+        self.config = config or Config()
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.INFO)
         self.download_path = "./downloads"  # 다운로드 폴더 지정
+        if self.config.site_name:
+            self.download_path = os.path.join(self.download_path, self.config.site_name)
         os.makedirs(self.download_path, exist_ok=True)  # 다운로드 폴더 생성
+        self._server_pool = None
+        self._cloud_pool = None
+        self._project_cache = None
+        self._source_project_cache = None
+        self._target_projects = None
+        self._project_mapper = None
+        # 통합 문서/흐름 ID별 연결된 게시 데이터 원본 ID (목록 조회 시 채움)
+        self._upstreams = {}
+        self._pool_lock = threading.RLock()
+        self.state = MigrationStateStore(self.config.migration['state_db'])
+        self.publisher = ChunkedPublisher(
+            chunk_size=self.config.migration['upload_chunk_size_mb'] * BYTES_PER_MB,
+            chunk_retries=self.config.migration['upload_chunk_retries'],
+            state=self.state
+        )
 
-    @contextmanager
-    def tableau_connection(self, is_cloud=False):
-        """Tableau 서버 연결 관리"""
-        conf = self.config.cloud if is_cloud else self.config.server
-        server = TSC.Server(conf['url'], use_server_version=True)
-        
+    def _session_pool(self, is_cloud):
+        """Server/Cloud 세션 풀 (최초 사용 시 생성)"""
+        attr = '_cloud_pool' if is_cloud else '_server_pool'
+        with self._pool_lock:
+            pool = getattr(self, attr)
+            if pool is None:
+                settings = self.config.migration
+                # Server 쪽은 다운로드 워커 외에 목록 조회용 세션 1개를 더 둠
+                size = settings['upload_workers'] if is_cloud else settings['download_workers'] + 1
+                # 스트리밍 전송은 다운로드 워커도 Cloud 업로드 세션에 청크를 보냄
+                if is_cloud and self.streaming():
+                    size += settings['download_workers']
+                label = 'Tableau Cloud' if is_cloud else 'Tableau Server'
+                if self.config.site_name:
+                    label = f"{label} ({self.config.site_name})"
+                pool = TableauSessionPool(
+                    self.config.cloud if is_cloud else self.config.server,
+                    label,
+                    size=size,
+                    token_ttl=settings['session_ttl_minutes'] * 60 or None,
+                    policy=self._request_policy(label, size)
+                )
+                if is_cloud:
+                    # 청크 전송도 Cloud 풀과 같은 재시도 예산과 동시 실행 한도를 사용
+                    self.publisher.policy = pool.policy
+                setattr(self, attr, pool)
+            return pool
+
+    def _request_policy(self, label, size):
+        """사이트별 API 재시도 정책 - 동시 실행 한도는 세션 풀 크기에서 시작"""
+        retry = self.config.retry
+        limiter = AdaptiveLimiter(label, max_limit=size) if retry['adaptive_concurrency'] else None
+        return RequestPolicy(
+            label,
+            max_retries=retry['max_attempts'],
+            base_delay=retry['base_delay'],
+            max_delay=retry['max_delay'],
+            budgets=parse_budgets(retry['budgets']),
+            default_budget=retry['budget'],
+            limiter=limiter
+        )
+
+    def project_cache(self):
+        """Tableau Cloud 프로젝트 캐시 (최초 사용 시 생성)"""
+        with self._pool_lock:
+            if self._project_cache is None:
+                cloud = self.config.cloud
+                self._project_cache = ProjectCache(
+                    self._session_pool(is_cloud=True),
+                    site_key=f"{cloud['url']}|{cloud['site']}",
+                    cache_path=self.config.migration['project_cache_path'],
+                    ttl_seconds=self.config.migration['project_cache_ttl'],
+                    page_size=self.config.migration['page_size']
+                )
+            return self._project_cache
+
+    def source_project_cache(self):
+        """Tableau Server 프로젝트 캐시 - 프로젝트 매핑의 원본 경로 계산용 (실행 중 메모리에만 보관)"""
+        with self._pool_lock:
+            if self._source_project_cache is None:
+                server = self.config.server
+                self._source_project_cache = ProjectCache(
+                    self._session_pool(is_cloud=False),
+                    site_key=f"{server['url']}|{server['site']}",
+                    page_size=self.config.migration['page_size']
+                )
+            return self._source_project_cache
+
+    def begin_cycle(self):
+        """daemon 모드의 다음 실행 준비 - 세션 풀과 상태 저장소는 그대로 두고 실행 단위 상태만 초기화
+
+        재시도 예산은 실행마다 다시 채우고, 프로젝트 목록은 PROJECT_CACHE_TTL_SECONDS보다 오래되었으면 다시 조회합니다.
+        """
+        ttl = self.config.migration['project_cache_ttl']
+        with self._pool_lock:
+            for pool in (self._server_pool, self._cloud_pool):
+                if pool is not None and pool.policy is not None:
+                    pool.policy.reset_budgets()
+            for cache in (self._project_cache, self._source_project_cache):
+                if cache is not None:
+                    cache.expire(ttl)
+
+    def close(self):
+        """실행 중 유지한 모든 세션 로그아웃"""
+        with self._pool_lock:
+            for attr in ('_server_pool', '_cloud_pool'):
+                pool = getattr(self, attr)
+                if pool is not None:
+                    pool.close()
+                    setattr(self, attr, None)
+        self.state.close()
+
+    def content_types(self):
+        """마이그레이션할 콘텐츠 유형 (CONTENT_TYPES, 목록 조회/실행 순서)"""
+        return parse_content_types(self.config.migration['content_types'])
+
+    def download_content(self, item):
+        """데이터 원본/통합 문서/흐름 다운로드 - 저장된 파일 경로와 내용 지문(DownloadedFile)을 반환"""
+        content_type = content_type_of(item)
         try:
-            auth = TSC.PersonalAccessTokenAuth(
-                token_name=conf['pat_name'],
-                personal_access_token=conf['pat_secret'],
-                site_id=conf['site']
-            )
-            server.auth.sign_in_with_personal_access_token(auth)
-            self.logger.info(f"Successfully connected to {'Tableau Cloud' if is_cloud else 'Tableau Server'}")
-            yield server
+            file_name = f"{item.name}_{datetime.now().isoformat()}"
+            with metrics.DOWNLOAD_SECONDS.labels(content_type).time():
+                downloaded = self._session_pool(is_cloud=False).run(
+                    lambda server: download_with_fingerprint(
+                        server, item.id, self.download_path, file_name, include_extract=True,
+                        content_type=content_type),
+                    operation='download'
+                )
+            metrics.TRANSFERRED_BYTES.labels('download').inc(downloaded.size)
+            metrics.CONTENT_BYTES.labels(content_type).observe(downloaded.size)
+            return downloaded
         except Exception as e:
-            self.logger.error(f"Failed to connect to {'Tableau Cloud' if is_cloud else 'Tableau Server'}: {str(e)}")
+            self.logger.error(f"Failed to download {item.name}: {str(e)}")
             raise
-        finally:
-            server.auth.sign_out()
 
-    def download_datasource(self, datasource):
-        """데이터 원본 다운로드"""
+    def streaming(self):
+        """다운로드 응답을 Cloud 업로드 세션으로 바로 보내는 전송 방식 사용 여부"""
+        return self.config.migration['transfer_mode'] == 'stream'
+
+    def stream_content(self, item):
+        """콘텐츠를 다운로드 폴더를 거치지 않고 Cloud 업로드 세션으로 전송 - 게시만 남은 StreamedUpload 반환
+
+        업로드 세션을 사용할 수 없거나 청크 전송이 실패하면 디스크에 저장하는 방식으로 전환하며,
+        이때는 DownloadedFile을 반환합니다. Server 토큰이 만료되었으면(401) TableauSessionPool.run과 같이
+        재로그인한 뒤 새 업로드 세션으로 한 번 더 스트리밍합니다.
+        """
+        content_type = content_type_of(item)
+        source_pool = self._session_pool(is_cloud=False)
+        target_pool = self._session_pool(is_cloud=True)
+
+        def stream():
+            with source_pool.session() as source, target_pool.session() as target:
+                def transfer():
+                    return stream_to_upload_session(
+                        source, target, self.publisher, item.id, item.name,
+                        chunk_size=self.publisher.chunk_size,
+                        buffer_chunks=self.config.migration['stream_buffer_chunks'],
+                        content_type=content_type
+                    )
+
+                try:
+                    return transfer()
+                except Exception as e:
+                    # 업로드 세션 쪽 오류는 StreamingNotPossible로 감싸지므로 인증 오류는 Server 세션의 것
+                    if not is_auth_error(e):
+                        raise
+                    source_pool.reauthenticate(source)
+                    return transfer()
+
         try:
-            file_name = f"{datasource.name}_{datetime.now().isoformat()}"
-            file_path = os.path.join(self.download_path, file_name)
-            
-            with self.tableau_connection(is_cloud=False) as server:
-                server.datasources.download(datasource.id, file_path, include_extract=True)
-                
-            # 실제 다운로드된 파일 경로 찾기
-            downloaded_file = None
-            for f in os.listdir(self.download_path):
-                if f.startswith(file_name):
-                    downloaded_file = os.path.join(self.download_path, f)
-                    break
-            
-            if not downloaded_file or not os.path.exists(downloaded_file):
-                raise FileNotFoundError(f"Downloaded file not found for {datasource.name}")
-                
-            return downloaded_file
+            # 스트리밍에서는 다운로드 시간에 업로드 세션 전송 시간이 포함됨
+            with metrics.DOWNLOAD_SECONDS.labels(content_type).time():
+                # 다운로드 쪽 일시 오류는 새 업로드 세션으로 처음부터 다시 스트리밍
+                streamed = source_pool.policy.call('download', stream) if source_pool.policy else stream()
+        except StreamingNotPossible as e:
+            self.logger.warning(f"Streaming {item.name} is not possible, spilling to disk: {str(e)}")
+            metrics.RETRIES.labels('stream_spill').inc()
+            return self.download_content(item)
         except Exception as e:
-            self.logger.error(f"Failed to download {datasource.name}: {str(e)}")
+            self.logger.error(f"Failed to download {item.name}: {str(e)}")
             raise
 
-    def upload_to_cloud(self, datasource_name, file_path):
-        """클라우드에 데이터 원본 업로드"""
+        metrics.TRANSFERRED_BYTES.labels('download').inc(streamed.size)
+        metrics.TRANSFERRED_BYTES.labels('upload').inc(streamed.size)
+        metrics.CONTENT_BYTES.labels(content_type).observe(streamed.size)
+        return streamed
+
+    def commit_streamed_upload(self, name, streamed, project_id=None, content_type='datasource'):
+        """스트리밍으로 채운 업로드 세션으로 콘텐츠 게시"""
+        item = new_item(content_type, project_id or self.config.cloud.get('project_id'), name)
         try:
-            with self.tableau_connection(is_cloud=True) as cloud:
-                # 프로젝트 ID 검증
-                project_id = self.config.cloud.get('project_id')
-                if not project_id:
-                    raise ValueError("Project ID is not configured in properties.env")
-                
-                # 프로젝트 존재 여부 확인
-                all_projects, _ = cloud.projects.get()
-                project_exists = any(p.id == project_id for p in all_projects)
-                
-                if not project_exists:
-                    raise ValueError(f"Project with ID {project_id} does not exist in Tableau Cloud")
-                
-                # 데이터 원본 게시
-                item = TSC.DatasourceItem(
-                    project_id=project_id,
-                    name=datasource_name
+            with metrics.PUBLISH_SECONDS.labels(content_type, 'stream').time():
+                published = self._session_pool(is_cloud=True).run(
+                    lambda cloud: self.publisher.commit(
+                        cloud, content_type, item, streamed.upload_id, streamed.file_extension),
+                    operation='publish'
                 )
-                cloud.datasources.publish(item, file_path, mode='Overwrite')
-                self.logger.info(f"Successfully published {datasource_name} to Tableau Cloud")
+            self.logger.info(f"Successfully published {name} to Tableau Cloud")
+            return published
         except Exception as e:
-            self.logger.error(f"Failed to upload {datasource_name}: {str(e)}")
+            self.logger.error(f"Failed to upload {name}: {str(e)}")
             raise
 
-    def migrate_datasource(self, datasource):
-        """단일 데이터 원본 마이그레이션"""
-        downloaded_file = None
+    def publish_transferred(self, item, transferred):
+        """다운로드 단계 결과(파일 또는 스트리밍 업로드 세션)를 Cloud에 게시
+
+        다운로드/게시 실패는 예외로 그대로 전달되어 파이프라인이 해당 항목을 failed로 기록합니다.
+        """
+        project_id = self.target_project_id(item)
+        content_type = content_type_of(item)
+        if isinstance(transferred, StreamedUpload):
+            return self.commit_streamed_upload(item.name, transferred, project_id=project_id,
+                                               content_type=content_type)
+        return self.upload_to_cloud(item.name, transferred.path, resume_key=item.id,
+                                    fingerprint=transferred.fingerprint, project_id=project_id,
+                                    content_type=content_type)
+
+    def upload_to_cloud(self, name, file_path, resume_key=None, fingerprint=None, project_id=None,
+                        content_type='datasource'):
+        """클라우드에 콘텐츠(기본값 데이터 원본) 업로드
+
+        UPLOAD_CHUNK_THRESHOLD_MB 이상인 파일은 업로드 세션 API로 청크 단위로 보내며,
+        resume_key와 fingerprint가 주어지면 중단된 업로드를 이어서 보냅니다.
+        project_id를 생략하면 TC_PROJECT_ID 프로젝트에 게시합니다.
+        """
+        file_size = os.path.getsize(file_path)
+        chunked = file_size >= self.config.migration['upload_chunk_threshold_mb'] * BYTES_PER_MB
+
+        def publish(cloud):
+            item = new_item(content_type, project_id, name)
+            if chunked:
+                return self.publisher.publish(cloud, content_type, item, file_path, mode='Overwrite',
+                                              resume_key=resume_key, fingerprint=fingerprint)
+            return getattr(cloud, CONTENT_TYPES[content_type].endpoint).publish(item, file_path, mode='Overwrite')
+
         try:
-            downloaded_file = self.download_datasource(datasource)
-            self.upload_to_cloud(datasource.name, downloaded_file)
+            if project_id is None:
+                # 프로젝트 ID 검증 - 존재 여부는 실행당 한 번만 확인하고 이후에는 캐시 사용
+                self.validate_target_project()
+                project_id = self.config.cloud.get('project_id')
+            with metrics.PUBLISH_SECONDS.labels(content_type, 'chunked' if chunked else 'single').time():
+                published = self._session_pool(is_cloud=True).run(publish, operation='publish')
+            metrics.TRANSFERRED_BYTES.labels('upload').inc(file_size)
+            self.logger.info(f"Successfully published {name} to Tableau Cloud")
+            return published
         except Exception as e:
-            self.logger.error(f"Failed to migrate {datasource.name}: {str(e)}")
-        finally:
-            if downloaded_file and os.path.exists(downloaded_file):
-                os.remove(downloaded_file)
+            self.logger.error(f"Failed to upload {name}: {str(e)}")
+            raise
+
+    def validate_target_project(self):
+        """대상 Cloud 프로젝트 설정/존재 여부 확인"""
+        project_id = self.config.cloud.get('project_id')
+        if not project_id:
+            raise ValueError("Project ID is not configured in properties.env")
+        self.project_cache().ensure_exists(project_id)
+
+    def prepare_target_projects(self, create=True):
+        """마이그레이션 전에 대상 프로젝트 준비 - 새로 만들어야 하는 프로젝트 경로 목록을 반환
+
+        프로젝트 매핑이 없으면 TC_PROJECT_ID만 검증합니다. 매핑이 있으면 원본 프로젝트 계층을
+        대상 경로로 변환하고, 없는 대상 프로젝트를 업로드 시작 전에 한꺼번에 생성합니다.
+        create=False(계획 모드)이면 생성하지 않고 만들어질 경로만 반환하며,
+        아직 없는 프로젝트에 매핑된 원본 프로젝트의 대상 ID는 None입니다.
+        """
+        if not self.config.project_mappings:
+            self.validate_target_project()
+            return []
+
+        mapper = ProjectMapper(self.config.project_mappings, self.source_project_cache().paths())
+        cache = self.project_cache()
+        missing = cache.missing_paths(mapper.required_paths())
+        if create:
+            target_ids = cache.ensure_paths(mapper.required_paths(), workers=self.config.migration['upload_workers'])
+        else:
+            target_ids = cache.path_ids()
+        self._project_mapper = mapper
+        self._target_projects = {
+            source_id: target_ids.get(mapper.target_path(source_id))
+            for source_id in mapper.source_paths
+            if mapper.target_path(source_id)
+        }
+        self.logger.info(f"Mapped {len(self._target_projects)} source projects to Tableau Cloud projects")
+        return missing
+
+    def is_mapped(self, datasource):
+        """프로젝트 매핑 대상 여부 (매핑이 없으면 모두 대상)"""
+        return self._target_projects is None or datasource.project_id in self._target_projects
+
+    def target_project_id(self, datasource):
+        """데이터 원본을 게시할 대상 프로젝트 ID (매핑이 없으면 None - TC_PROJECT_ID 사용)"""
+        if self._target_projects is None:
+            return None
+        return self._target_projects[datasource.project_id]
+
+    def publish_project_id(self, item):
+        """항목을 게시할 대상 프로젝트 ID - 매핑이 없으면 TC_PROJECT_ID (아직 없는 매핑 대상 프로젝트는 None)"""
+        if self._target_projects is None:
+            return self.config.cloud.get('project_id')
+        return self.target_project_id(item)
+
+    def publish_target(self, item):
+        """상태 저장소에 지문/버전과 함께 기록하는 게시 위치 ('Cloud 사이트/프로젝트 ID')
+
+        TC_PROJECT_ID나 프로젝트 매핑이 바뀌면 위치가 달라지므로, 이전 위치에 게시한 기록으로 건너뛰지 않습니다.
+        """
+        return f"{self.config.cloud.get('site')}/{self.publish_project_id(item)}"
+
+    def target_project_path(self, datasource):
+        """데이터 원본을 게시할 대상 프로젝트 경로 (매핑이 없으면 None)"""
+        if self._project_mapper is None:
+            return None
+        return self._project_mapper.target_path(datasource.project_id)
+
+    def remove_downloaded_file(self, downloaded):
+        """다운로드 파일 정리 (스트리밍 전송은 남는 파일이 없음)"""
+        path = getattr(downloaded, 'path', None)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def unchanged_reason(self, datasource, downloaded):
+        """같은 위치에 마지막으로 게시한 파일과 내용이 같으면 건너뛸 사유를 반환 (FORCE_REPUBLISH이면 항상 게시)"""
+        if self.config.migration['force_republish']:
+            return None
+        if self.state.fingerprint(datasource.id, self.publish_target(datasource)) == downloaded.fingerprint:
+            self.logger.info(f"Skipping {datasource.name}: content unchanged since last publish")
+            return 'unchanged'
+        return None
+
+    def _content_list_options(self, page_number, page_size, updated_since=None, content_type='datasource'):
+        """콘텐츠 목록 요청 옵션 - 인벤토리에 필요한 필드를 목록 응답에 함께 요청"""
+        options = TSC.RequestOptions(pagenumber=page_number, pagesize=page_size)
+        # fields 지정은 tableauserverclient 버전에 따라 지원되지 않을 수 있음
+        if isinstance(getattr(options, 'fields', None), set):
+            options.fields.update(CONTENT_TYPES[content_type].list_fields)
+        if updated_since:
+            options.filter.add(TSC.Filter(
+                TSC.RequestOptions.Field.UpdatedAt,
+                TSC.RequestOptions.Operator.GreaterThanOrEqual,
+                updated_since.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            ))
+        return options
+
+    def _has_inventory_fields(self, datasource):
+        """목록 응답만으로 인벤토리 필드가 채워졌는지 여부"""
+        return datasource.updated_at is not None and datasource.owner_id is not None
+
+    def content_upstreams(self, item):
+        """통합 문서/흐름이 연결된 게시 데이터 원본 ID 집합 (데이터 원본이거나 연결을 조회하지 않았으면 빈 집합)"""
+        return self._upstreams.get(item.id, frozenset())
+
+    def _populate_upstreams(self, pool, content_type, item):
+        """통합 문서/흐름의 연결 정보를 조회해 상위 데이터 원본 ID를 기록
+
+        목록 조회 제너레이터 안에서 실행되므로 항목 하나의 조회 실패(실행 중 삭제, 권한 없음, 재시도 예산 소진)가
+        실행 전체를 멈추지 않도록 오류는 기록만 하고 상위 항목을 알 수 없는 것(기다리지 않음)으로 처리합니다.
+        삭제되었거나 권한이 없는 항목은 다운로드 단계에서 실패로 기록됩니다.
+        """
+        endpoint = CONTENT_TYPES[content_type].endpoint
+
+        def fetch(server):
+            # populate_connections는 지연 조회이므로 세션을 반납하기 전에 연결 목록을 읽음
+            getattr(server, endpoint).populate_connections(item)
+            return list(item.connections)
 
-    def migrate_all_datasources(self):
-        """모든 데이터 원본 마이그레이션"""
         try:
-            migration_results = {
-                'total': 0,
-                'success': 0,
-                'failed': 0,
-                'details': []
-            }
+            with metrics.DETAIL_FETCH_SECONDS.labels(f"{endpoint}_connections").time():
+                connections = pool.run(fetch, operation='detail')
+        except Exception as e:
+            self.logger.warning(f"Could not fetch connections of {item.name}, "
+                                f"migrating it without waiting for its datasources: {str(e)}")
+            return item
+        # 게시 데이터 원본에 연결된(sqlproxy) 연결의 datasource_id가 상위 데이터 원본
+        self._upstreams[item.id] = frozenset(
+            connection.datasource_id for connection in connections
+            if connection.connection_type == 'sqlproxy' and connection.datasource_id
+        )
+        return item
 
-            print("\n1. 데이터 원본 수집 중...")
-            with self.tableau_connection(is_cloud=False) as server:
-                all_datasources, _ = server.datasources.get()
-                migration_results['total'] = len(all_datasources)
-
-                # 프로그레스바로 데이터 원본 정보 수집
-                print("\n2. 데이터 원본 상세 정보:")
-                print(f"{'데이터 원본명':<30} {'최종 수정일':<20} {'소유자':<20}")
-                print("-" * 70)
-                
-                for ds in tqdm(all_datasources, desc="데이터 원본 정보 수집"):
-                    ds = server.datasources.get_by_id(ds.id)
+    def iter_content(self, content_type='datasource', on_total=None, updated_since=None, on_fallback=None):
+        """Tableau Server의 한 콘텐츠 유형 전체를 페이지 단위로 지연 조회
+
+        인벤토리 필드(updated_at, owner_id)는 목록 응답을 그대로 사용하고,
+        응답에 빠진 항목만 get_by_id로 동시에 보충합니다.
+        updated_since를 지정하면 updatedAt 필터로 서버에서 대상만 걸러 받으며,
+        서버가 필터를 거부하면 전체 목록으로 다시 조회하고 on_fallback을 호출합니다.
+        데이터 원본도 함께 마이그레이션하면 통합 문서/흐름은 연결 정보도 동시에 조회해 의존 관계를 기록합니다.
+        """
+        pool = self._session_pool(is_cloud=False)
+        endpoint = CONTENT_TYPES[content_type].endpoint
+
+        def fetch_detail(item):
+            with metrics.DETAIL_FETCH_SECONDS.labels(endpoint).time():
+                return pool.run(lambda server: getattr(server, endpoint).get_by_id(item.id), operation='detail')
+
+        items = iter_all_pages(
+            pool,
+            endpoint,
+            page_size=self.config.migration['page_size'],
+            options_factory=lambda page_number, page_size: self._content_list_options(
+                page_number, page_size, updated_since, content_type),
+            on_total=on_total,
+            fallback_factory=lambda page_number, page_size: TSC.RequestOptions(pagenumber=page_number,
+                                                                                pagesize=page_size),
+            on_fallback=on_fallback
+        )
+        items = hydrate(
+            items,
+            is_complete=self._has_inventory_fields,
+            fetch_detail=fetch_detail,
+            workers=self.config.migration['detail_workers']
+        )
+        if content_type != 'datasource' and 'datasource' in self.content_types():
+            items = hydrate(
+                items,
+                is_complete=lambda item: False,
+                fetch_detail=lambda item: self._populate_upstreams(pool, content_type, item),
+                workers=self.config.migration['detail_workers']
+            )
+        return items
+
+    def scheduler(self, results=None, run_id=None):
+        """SCHEDULE_ORDER/PRIORITY_RULES 순서의 MigrationScheduler
+
+        results를 지정하면 실행 시작 시각 기준 RUN_DEADLINE_MINUTES 마감을 적용하고, 마감으로 시작하지 못한
+        항목을 'deferred'로 results와 상태 저장소에 기록합니다. 상태 저장소에서 deferred는 성공이 아니므로
+        다음 'updated' 실행의 대상에 다시 포함됩니다.
+        """
+        schedule = self.config.schedule
+        source_paths = {}
+
+        def size(ds):
+            return self.datasource_size(ds, self.state.transfer_history(ds.id))[0]
+
+        def project_path(ds):
+            # project 규칙이 있을 때만 원본 프로젝트 목록을 한 번 조회
+            if not source_paths:
+                source_paths.update(self.source_project_cache().paths())
+            return source_paths.get(ds.project_id, getattr(ds, 'project_name', None))
+
+        def defer(item):
+            self.record_unstarted(results, run_id, item, 'deferred', 'deadline')
+
+        return MigrationScheduler(
+            order=schedule['order'],
+            rules=parse_priority_rules(schedule['priority_rules']),
+            deadline=run_deadline(results.started_at, schedule['deadline_minutes']) if results else None,
+            size_fn=size,
+            project_path_fn=project_path,
+            on_defer=defer if results else None
+        )
+
+    def record_unstarted(self, results, run_id, item, status, reason):
+        """실행하지 않은 항목(deferred: 마감 시각 초과, blocked: 상위 데이터 원본 실패) 기록
+
+        상태 저장소에서는 성공이 아니므로 다음 'updated' 실행의 대상에 다시 포함됩니다.
+        """
+        content_type = content_type_of(item)
+        metrics.OUTCOMES.labels(content_type, status).inc()
+        results.update(item.id, status, reason=reason)
+        self.state.record(run_id, item.id, item.name, item.updated_at, status, content_type=content_type)
+
+    def skipped_upstream(self, selection, item):
+        """건너뛴(매핑 대상 아님 등) 상위 데이터 원본 ID - 대상에 없으므로 하위 항목도 게시하지 않음 (계획 모드용)"""
+        for upstream_id in sorted(self.content_upstreams(item)):
+            if selection.dependency_status(upstream_id) == 'skipped':
+                return upstream_id
+        return None
+
+    def skip_dependent(self, results, item, upstream_id):
+        """상위 데이터 원본을 건너뛴 통합 문서/흐름 기록
+
+        대상 선별에서 건너뛴 항목과 같이 상태 저장소에는 기록하지 않습니다.
+        """
+        self.logger.info(f"Skipping {item.name}: upstream datasource {upstream_id} was skipped")
+        results.update(item.id, 'skipped', reason='upstream_skipped')
+
+    def run_migration(self, items, results, run_id=None):
+        """다운로드/업로드 파이프라인으로 콘텐츠 마이그레이션 실행
+
+        items는 목록 조회와 함께 지연 생성되는 이터러블일 수 있으므로,
+        진행률 전체 개수는 results.queued가 늘어나는 대로 갱신합니다.
+        항목별 결과는 results와 상태 저장소에 run_id와 함께 기록됩니다.
+        처리 순서와 실행 마감 시각은 scheduler()가 정하며, 통합 문서/흐름은 DependencyGate가
+        연결된 데이터 원본의 결과가 나온 뒤에 파이프라인으로 보냅니다. 의존 관계가 없는 항목은 기다리지 않습니다.
+        """
+        # 대상 프로젝트는 업로드 전에 한 번만 검증/생성
+        self.prepare_target_projects()
+        scheduler = self.scheduler(results, run_id)
+        gate = DependencyGate(
+            upstream_fn=self.content_upstreams,
+            status_fn=results.dependency_status,
+            on_blocked=lambda item, upstream_id: self.record_unstarted(
+                results, run_id, item, 'blocked', 'upstream_not_migrated'),
+            on_skipped=lambda item, upstream_id: self.skip_dependent(results, item, upstream_id),
+            expired=scheduler.expired,
+            on_defer=scheduler.defer
+        )
+
+        settings = self.config.migration
+        pipeline = MigrationPipeline(
+            download_fn=self.stream_content if self.streaming() else self.download_content,
+            upload_fn=self.publish_transferred,
+            cleanup_fn=self.remove_downloaded_file,
+            skip_fn=self.unchanged_reason,
+            download_workers=settings['download_workers'],
+            upload_workers=settings['upload_workers'],
+            queue_size=settings['queue_size']
+        )
+
+        with tqdm(total=results.queued or None, desc="마이그레이션 진행") as progress:
+            def on_result(result):
+                ds = result['item']
+                content_type = content_type_of(ds)
+                metrics.OUTCOMES.labels(content_type, result['status']).inc()
+                if result['status'] == 'failed':
+                    self.logger.error(f"Failed to migrate {ds.name}: {result['error']}")
+                results.record(result)
+                if result['status'] == 'success' and self.content_upstreams(ds):
+                    # 게시 데이터 원본 연결은 원본 Server를 가리킨 채로 게시되므로 리포트에 표시
+                    self.logger.warning(f"{ds.name} still connects to published datasources on Tableau Server; "
+                                        f"reconnect it to the migrated datasources on Tableau Cloud")
+                    results.update(ds.id, 'success', reason=RECONNECT_REASON)
+                # 이 항목을 기다리던 통합 문서/흐름 확인
+                gate.notify()
+
+                published = result['output'] if result['status'] == 'success' else None
+                downloaded = result['downloaded']
+                # 전송 시간은 실제로 게시한 경우만 기록 (계획 모드의 처리량 계산용)
+                timed = published is not None
+                self.state.record(
+                    run_id, ds.id, ds.name, ds.updated_at, result['status'],
+                    target_id=published.id if published is not None else None,
+                    error=result['error'],
+                    fingerprint=downloaded.fingerprint if downloaded else None,
+                    size=downloaded.size if downloaded else None,
+                    download_seconds=result['download_seconds'] if timed else None,
+                    upload_seconds=result['upload_seconds'] if timed else None,
+                    content_type=content_type,
+                    target=self.publish_target(ds) if downloaded else None
+                )
+                if progress.total != results.queued:
+                    progress.total = results.queued
+                progress.update(1)
+
+            pipeline.run(gate.release(scheduler.schedule(items)), on_result=on_result)
+
+    def display_name(self, name, content_type):
+        """출력용 이름 - 데이터 원본 외의 콘텐츠는 유형을 함께 표시"""
+        return name if content_type == 'datasource' else f"{name} [{content_type}]"
+
+    def print_content_counts(self, results):
+        """여러 콘텐츠 유형을 마이그레이션한 경우 유형별 항목 수 출력"""
+        if len(self.content_types()) < 2:
+            return
+        counts = results.content_type_counts()
+        print("콘텐츠 유형별: " + ", ".join(f"{content_type} {counts[content_type]}"
+                                          for content_type in self.content_types()))
+
+    def print_reconnect_needed(self, results):
+        """게시 데이터 원본 연결을 Cloud 데이터 원본으로 다시 연결해야 하는 통합 문서/흐름 출력"""
+        entries = [entry for entry in results.items('success') if entry['reason'] == RECONNECT_REASON]
+        if not entries:
+            return
+        print(f"\n연결 확인 필요 (원본 Server의 게시 데이터 원본에 연결됨): {len(entries)}")
+        for entry in entries:
+            print(f"! {self.display_name(entry['name'], entry['content_type'])}")
+
+    def print_slowest(self, results, number):
+        """전송 시간이 가장 긴 데이터 원본 출력"""
+        slowest = results.slowest()
+        if not slowest:
+            return
+        print(f"\n{number}. 전송 시간이 가장 긴 데이터 원본:")
+        for entry in slowest:
+            size_mb = (entry['bytes'] or 0) / BYTES_PER_MB
+            print(f"- {self.display_name(entry['name'], entry['content_type'])}: "
+                  f"{entry['total_seconds']:.1f}초 ({size_mb:.1f} MB)")
+
+    def write_reports(self, results):
+        """JSON/CSV 리포트 저장 (REPORT_DIR) - MigrationResults 또는 MigrationPlan"""
+        report_dir = self.config.migration['report_dir']
+        if not report_dir:
+            return
+        try:
+            paths = results.write_reports(report_dir)
+            print(f"\n리포트: {', '.join(paths)}")
+        except OSError as e:
+            self.logger.error(f"Failed to write migration report: {str(e)}")
+
+    def select_all_content(self, results, completed=frozenset()):
+        """'all' 실행의 대상 선별 - CONTENT_TYPES의 모든 항목을 results에 등록하고 대상만 차례로 반환
+
+        매핑 대상이 아니거나 completed(이어서 실행할 때 이전 실행에서 완료된 ID)에 있는 항목은
+        사유와 함께 skipped로 등록합니다. 데이터 원본부터 유형 순서대로 조회합니다.
+        """
+        def add_total(total):
+            results.total += total or 0
+
+        for content_type in self.content_types():
+            for item in self.iter_content(content_type, on_total=add_total):
+                if not self.is_mapped(item):
+                    results.add(item, 'skipped', reason='unmapped_project', content_type=content_type)
+                elif item.id in completed:
+                    results.add(item, 'skipped', reason='completed_in_previous_run', content_type=content_type)
+                else:
+                    results.add(item, content_type=content_type)
+                    yield item
+
+    def update_selection(self):
+        """'updated' 실행 기준 (watermark, cutoff)
+
+        상태 저장소에 완료된 실행이 있으면 그 실행 시각(watermark)을, 없으면 UPDATE_CRITERIA 기준 시각을
+        cutoff로 사용합니다. 기준이 없으면 cutoff는 None입니다.
+        """
+        watermark = self.state.watermark()
+        return watermark, watermark or self.update_cutoff()
+
+    def select_updated_content(self, results, completed, watermark, cutoff, filter_state):
+        """'updated' 실행의 대상 선별 - CONTENT_TYPES의 모든 항목을 results에 등록하고 업데이트 대상만 차례로 반환
+
+        filter_state['server_filtered']는 서버가 updatedAt 필터를 거부하면 False로 바뀌며,
+        이때는 기준 시각을 로컬에서 비교합니다.
+        """
+        def needs_update(ds):
+            if self.state.is_up_to_date(ds.id, ds.updated_at, self.publish_target(ds)):
+                return False
+            # 서버가 updatedAt 필터를 거부한 경우에만 로컬에서 기준 비교
+            if filter_state['server_filtered']:
+                return True
+            if watermark:
+                return ds.updated_at >= watermark
+            return self.check_update_needed(ds.updated_at)
+
+        def add_total(total):
+            results.total += total or 0
+
+        def disable_server_filter():
+            filter_state['server_filtered'] = False
+
+        for content_type in self.content_types():
+            items = self.iter_content(
+                content_type,
+                on_total=add_total,
+                updated_since=cutoff,
+                on_fallback=disable_server_filter
+            )
+            for item in items:
+                if not self.is_mapped(item):
+                    reason = 'unmapped_project'
+                elif not item.updated_at:
+                    reason = 'no_updated_at'
+                elif item.id in completed:
+                    reason = 'completed_in_previous_run'
+                elif needs_update(item):
+                    results.add(item, content_type=content_type)
+                    yield item
+                    continue
+                else:
+                    reason = 'up_to_date'
+                results.add(item, 'skipped', reason=reason, content_type=content_type)
+
+    def migrate_all_datasources(self, resume=False):
+        """모든 데이터 원본 마이그레이션 - 실행 결과(MigrationResults)를 반환
+
+        resume이면 중단된 이전 'all' 실행을 이어서, 그 실행에서 이미 성공한 항목은 건너뜁니다.
+        """
+        run_id = None
+        run_status = 'interrupted'
+        started = time.monotonic()
+        results = None
+        try:
+            run_id, resumed = self.state.start_run('all', resume=resume)
+            results = MigrationResults('all', run_id)
+            completed = self.state.completed_in_run(run_id) if resumed else set()
+            if resumed:
+                print(f"\n중단된 실행(#{run_id})을 이어서 진행합니다. 완료된 항목: {len(completed)}")
+
+            def collect_datasources():
+                # 페이지가 도착하는 대로 상세 정보를 출력하고 곧바로 마이그레이션 대상으로 넘김
+                for ds in self.select_all_content(results, completed):
                     updated_at = ds.updated_at.strftime('%Y-%m-%d %H:%M:%S') if ds.updated_at else 'N/A'
                     owner = ds.owner_id if hasattr(ds, 'owner_id') else 'Unknown'
-                    
-                    print(f"{ds.name:<30} {updated_at:<20} {owner:<20}")
-                    migration_results['details'].append({
-                        'name': ds.name,
-                        'updated_at': updated_at,
-                        'owner': owner,
-                        'status': 'pending'
-                    })
-
-            # 마이그레이션 실행
+
+                    tqdm.write(f"{self.display_name(ds.name, content_type_of(ds)):<30} {updated_at:<20} {owner:<20}")
+                    yield ds
+
+            print("\n1. 데이터 원본 수집 중...")
+            print("\n2. 데이터 원본 상세 정보:")
+            print(f"{'데이터 원본명':<30} {'최종 수정일':<20} {'소유자':<20}")
+            print("-" * 70)
+
+            # 마이그레이션 실행 - 목록 조회와 동시에 진행
             print("\n3. 마이그레이션 실행 중...")
-            for ds in tqdm(all_datasources, desc="마이그레이션 진행"):
-                try:
-                    self.migrate_datasource(ds)
-                    migration_results['success'] += 1
-                    # 결과 상태 업데이트
-                    for detail in migration_results['details']:
-                        if detail['name'] == ds.name:
-                            detail['status'] = 'success'
-                except Exception as e:
-                    migration_results['failed'] += 1
-                    # 결과 상태 업데이트
-                    for detail in migration_results['details']:
-                        if detail['name'] == ds.name:
-                            detail['status'] = 'failed'
-                            detail['error'] = str(e)
+            self.run_migration(collect_datasources(), results, run_id=run_id)
 
             # 최종 결과 출력
             print("\n4. 마이그레이션 결과 요약:")
-            print(f"총 데이터 원본 수: {migration_results['total']}")
-            print(f"성공: {migration_results['success']}")
-            print(f"실패: {migration_results['failed']}")
+            print(f"총 데이터 원본 수: {results.total}")
+            print(f"성공: {results.count('success')}")
+            print(f"실패: {results.count('failed')}")
+            print(f"건너뜀 (변경 없음): {results.count('unchanged')}")
+            if results.count('skipped') > 0:
+                print(f"건너뜀 (이전 실행에서 완료 또는 매핑 대상 아님): {results.count('skipped')}")
+            if results.count('deferred') > 0:
+                print(f"다음 실행으로 미룸 (실행 마감 시각 초과): {results.count('deferred')}")
+            if results.count('blocked') > 0:
+                print(f"게시하지 않음 (연결된 데이터 원본 마이그레이션 실패): {results.count('blocked')}")
+            self.print_content_counts(results)
+            self.print_reconnect_needed(results)
 
             # 성공/실패 상세 내역
-            if migration_results['success'] > 0:
+            if results.count('success') > 0:
                 print("\n5. 성공한 데이터 원본:")
-                for detail in migration_results['details']:
-                    if detail['status'] == 'success':
-                        print(f"✓ {detail['name']} ({detail['updated_at']})")
+                for entry in results.items('success'):
+                    updated_at = entry['updated_at']
+                    print(f"✓ {self.display_name(entry['name'], entry['content_type'])} ({updated_at.strftime('%Y-%m-%d %H:%M:%S') if updated_at else 'N/A'})")
 
-            if migration_results['failed'] > 0:
+            if results.count('failed') > 0:
                 print("\n6. 실패한 데이터 원본:")
-                for detail in migration_results['details']:
-                    if detail['status'] == 'failed':
-                        print(f"✗ {detail['name']}: {detail.get('error', 'Unknown error')}")
+                for entry in results.items('failed'):
+                    print(f"✗ {self.display_name(entry['name'], entry['content_type'])}: "
+                          f"{entry['error'] or 'Unknown error'}")
 
+            self.print_slowest(results, 7)
+            run_status = 'completed'
         except Exception as e:
+            run_status = 'failed'
             self.logger.error(f"Failed to migrate all datasources: {str(e)}")
+        finally:
+            if run_id is not None:
+                self.state.finish_run(run_id, run_status)
+            if results is not None:
+                results.finish()
+                self.write_reports(results)
+            self.record_run_metrics('all', run_status, started)
+        return results if run_status == 'completed' else None
 
     def check_update_needed(self, updated_at):
         """업데이트 필요 여부 확인"""
@@ -192,105 +788,193 @@ class TableauMigrationWorker:
         
         return False
 
-    def migrate_updated_datasources(self):
-        """업데이트된 데이터 원본 마이그레이션"""
+    def update_cutoff(self):
+        """업데이트 기준 시각 - 이 시각 이후 수정된 데이터 원본이 업데이트 대상"""
+        criteria_type = self.config.update_criteria['type']
+        criteria_value = self.config.update_criteria['value']
+        if criteria_type not in ('days', 'hours', 'minutes'):
+            return None
+        return datetime.now(timezone.utc) - timedelta(**{criteria_type: criteria_value})
+
+    def migrate_updated_datasources(self, resume=False):
+        """업데이트된 데이터 원본 마이그레이션 - 실행 결과(MigrationResults)를 반환
+
+        상태 저장소에 완료된 실행이 있으면 그 실행 이후 변경된 데이터 원본만 대상으로 하고,
+        없으면 UPDATE_CRITERIA_TYPE/VALUE 기준을 사용합니다.
+        """
+        run_id = None
+        run_status = 'interrupted'
+        started = time.monotonic()
+        results = None
         try:
-            updated_datasources = []
-            migration_results = {
-                'total': 0,
-                'updated': 0,
-                'success': 0,
-                'failed': 0,
-                'skipped': 0,
-                'details': []
-            }
-            
+            watermark, cutoff = self.update_selection()
+            filter_state = {'server_filtered': cutoff is not None}
+
+            run_id, resumed = self.state.start_run('updated', resume=resume)
+            results = MigrationResults('updated', run_id)
+            completed = self.state.completed_in_run(run_id) if resumed else set()
+            if resumed:
+                print(f"\n중단된 실행(#{run_id})을 이어서 진행합니다. 완료된 항목: {len(completed)}")
+
+            def collect_updated_datasources():
+                # 페이지가 도착하는 대로 검사하고 업데이트 대상만 곧바로 마이그레이션으로 넘김
+                selected = self.select_updated_content(results, completed, watermark, cutoff, filter_state)
+                for ds in selected:
+                    name = self.display_name(ds.name, content_type_of(ds))
+                    tqdm.write(f"{name:<30} {ds.updated_at.strftime('%Y-%m-%d %H:%M:%S'):<20}")
+                    yield ds
+
             print("\n1. 데이터 원본 검사 중...")
-            with self.tableau_connection(is_cloud=False) as server:
-                all_datasources, _ = server.datasources.get()
-                migration_results['total'] = len(all_datasources)
-                
-                # 프로그레스바로 데이터 원본 검사
-                for ds in tqdm(all_datasources, desc="데이터 원본 검사"):
-                    ds = server.datasources.get_by_id(ds.id)
-                    
-                    if ds.updated_at:
-                        status = {
-                            'name': ds.name,
-                            'updated_at': ds.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-                            'status': 'pending'
-                        }
-                        
-                        if self.check_update_needed(ds.updated_at):
-                            status['status'] = 'update_needed'
-                            updated_datasources.append(ds)
-                            migration_results['updated'] += 1
-                        else:
-                            status['status'] = 'skipped'
-                            migration_results['skipped'] += 1
-                            
-                        migration_results['details'].append(status)
-                    else:
-                        migration_results['skipped'] += 1
-            
-            # 업데이트 대상 요약 출력
             print("\n2. 업데이트 대상 데이터 원본:")
             print(f"{'데이터 원본명':<30} {'마지막 업데이트':<20}")
             print("-" * 50)
-            for detail in migration_results['details']:
-                if detail['status'] == 'update_needed':
-                    print(f"{detail['name']:<30} {detail['updated_at']:<20}")
-            
-            # 마이그레이션 실행
+
+            # 마이그레이션 실행 - 목록 조회/검사와 동시에 진행
             print("\n3. 마이그레이션 실행 중...")
-            for ds in tqdm(updated_datasources, desc="마이그레이션 진행"):
-                try:
-                    self.migrate_datasource(ds)
-                    migration_results['success'] += 1
-                    # 결과 상태 업데이트
-                    for detail in migration_results['details']:
-                        if detail['name'] == ds.name:
-                            detail['status'] = 'success'
-                except Exception as e:
-                    migration_results['failed'] += 1
-                    # 결과 상태 업데이트
-                    for detail in migration_results['details']:
-                        if detail['name'] == ds.name:
-                            detail['status'] = 'failed'
-                            detail['error'] = str(e)
-            
+            self.run_migration(collect_updated_datasources(), results, run_id=run_id)
+
             # 최종 결과 출력
             print("\n4. 마이그레이션 결과 요약:")
-            print(f"총 데이터 원본 수: {migration_results['total']}")
-            print(f"업데이트 대상: {migration_results['updated']}")
-            print(f"성공: {migration_results['success']}")
-            print(f"실패: {migration_results['failed']}")
-            print(f"건너뜀: {migration_results['skipped']}")
-            
+            if cutoff is not None:
+                basis = '마지막 성공 실행 이후' if watermark else '업데이트 기준 설정'
+                where = '서버 필터' if filter_state['server_filtered'] else '로컬 비교'
+                print(f"기준 시각: {cutoff.strftime('%Y-%m-%d %H:%M:%S')} UTC ({basis}, {where})")
+            print(f"총 데이터 원본 수: {results.total}")
+            print(f"업데이트 대상: {results.queued}")
+            print(f"성공: {results.count('success')}")
+            print(f"실패: {results.count('failed')}")
+            print(f"건너뜀: {results.count('skipped')}")
+            print(f"건너뜀 (변경 없음): {results.count('unchanged')}")
+            if results.count('deferred') > 0:
+                print(f"다음 실행으로 미룸 (실행 마감 시각 초과): {results.count('deferred')}")
+            if results.count('blocked') > 0:
+                print(f"게시하지 않음 (연결된 데이터 원본 마이그레이션 실패): {results.count('blocked')}")
+            self.print_content_counts(results)
+            self.print_reconnect_needed(results)
+
             # 실패한 항목이 있다면 상세 내역 출력
-            if migration_results['failed'] > 0:
+            if results.count('failed') > 0:
                 print("\n5. 실패한 데이터 원본:")
-                for detail in migration_results['details']:
-                    if detail['status'] == 'failed':
-                        print(f"- {detail['name']}: {detail.get('error', 'Unknown error')}")
-                        
+                for entry in results.items('failed'):
+                    print(f"- {self.display_name(entry['name'], entry['content_type'])}: "
+                          f"{entry['error'] or 'Unknown error'}")
+
+            self.print_slowest(results, 6)
+            run_status = 'completed'
         except Exception as e:
+            run_status = 'failed'
             self.logger.error(f"Failed to migrate updated datasources: {str(e)}")
+        finally:
+            if run_id is not None:
+                self.state.finish_run(run_id, run_status)
+            if results is not None:
+                results.finish()
+                self.write_reports(results)
+            self.record_run_metrics('updated', run_status, started)
+        return results if run_status == 'completed' else None
+
+    def existing_target_content(self):
+        """대상 Cloud 사이트의 콘텐츠를 (유형, 프로젝트 ID, 이름)별로 색인 - 게시하면 덮어쓰게 될 항목 확인용"""
+        pool = self._session_pool(is_cloud=True)
+        return {
+            (content_type, item.project_id, item.name): item
+            for content_type in self.content_types()
+            for item in iter_all_pages(pool, CONTENT_TYPES[content_type].endpoint,
+                                       page_size=self.config.migration['page_size'])
+        }
+
+    def datasource_size(self, datasource, history):
+        """계획에 사용할 크기와 출처 - 이전 실행에서 측정한 크기, 목록 응답의 size 메타데이터 순"""
+        if history:
+            return history['bytes'], 'measured'
+        size = metadata_size(datasource)
+        if size:
+            return size, 'metadata'
+        return None, 'unknown'
+
+    def plan_migration(self, basis='all'):
+        """데이터를 전송하지 않고 basis('all'/'updated') 실행의 계획과 예상 비용 계산 - MigrationPlan을 반환
+
+        대상 선별은 실제 실행과 같은 방식을 사용하며, 프로젝트를 만들거나 실행 이력을 남기지 않습니다.
+        """
+        run_status = 'interrupted'
+        started = time.monotonic()
+        plan = None
+        try:
+            print("\n1. 대상 프로젝트 확인 중...")
+            missing_projects = self.prepare_target_projects(create=False)
+
+            print("\n2. 마이그레이션 대상 수집 중...")
+            selection = MigrationResults(basis)
+            if basis == 'all':
+                selected = self.select_all_content(selection)
+            else:
+                watermark, cutoff = self.update_selection()
+                filter_state = {'server_filtered': cutoff is not None}
+                selected = self.select_updated_content(selection, set(), watermark, cutoff, filter_state)
+            # 계획 항목은 실제 실행과 같은 순서로 나열
+            datasources = self.scheduler().sort(selected)
+            print(f"총 항목 수: {selection.total}, 대상: {len(datasources)}")
+
+            print("\n3. Tableau Cloud의 기존 콘텐츠와 비교 중...")
+            existing = self.existing_target_content()
+
+            settings = self.config.migration
+            plan = MigrationPlan(basis, settings['download_workers'], settings['upload_workers'],
+                                 site=self.config.site_name, rates=throughput(self.state.transfer_stats()))
+            for path in missing_projects:
+                plan.add_project(path)
+            for ds in datasources:
+                if self.skipped_upstream(selection, ds):
+                    selection.update(ds.id, 'skipped', reason='upstream_skipped')
+                    continue
+                # 아직 없는 대상 프로젝트(None)에 게시하는 항목은 모두 새로 생성
+                project_id = self.publish_project_id(ds)
+                content_type = content_type_of(ds)
+                target = existing.get((content_type, project_id, ds.name)) if project_id else None
+                history = self.state.transfer_history(ds.id)
+                size, size_source = self.datasource_size(ds, history)
+                plan.add(
+                    'overwrite' if target is not None else 'create', ds,
+                    size=size, size_source=size_source, history=history,
+                    content_type=content_type,
+                    target_project_id=project_id,
+                    target_project_path=self.target_project_path(ds),
+                    target_id=target.id if target is not None else None,
+                    depends_on=';'.join(sorted(self.content_upstreams(ds))) or None
+                )
+            for entry in selection.items('skipped'):
+                plan.skip(entry)
+
+            plan.print_summary()
+            run_status = 'completed'
+        except Exception as e:
+            run_status = 'failed'
+            self.logger.error(f"Failed to plan migration: {str(e)}")
+        finally:
+            if plan is not None and run_status == 'completed':
+                self.write_reports(plan)
+            self.record_run_metrics('plan', run_status, started)
+        return plan if run_status == 'completed' else None
+
+    def record_run_metrics(self, mode, status, started):
+        """실행 소요 시간과 종료 시각 지표 기록"""
+        metrics.RUN_SECONDS.labels(mode).set(time.monotonic() - started)
+        metrics.RUN_FINISHED.labels(mode, status).set_to_current_time()
 
     def list_cloud_projects(self):
         """Tableau Cloud의 프로젝트 목록 조회"""
         try:
-            with self.tableau_connection(is_cloud=True) as cloud:
-                all_projects, _ = cloud.projects.get()
-                
-                print("\n사용 가능한 프로젝트 목록:")
-                print(f"{'번호':<4} {'프로젝트명':<30} {'프로젝트 ID':<36}")
-                print("-" * 70)
-                
-                for idx, project in enumerate(all_projects, 1):
-                    print(f"{idx:<4} {project.name:<30} {project.id:<36}")
-                
-                return all_projects
+            all_projects = self.project_cache().projects()
+
+            print("\n사용 가능한 프로젝트 목록:")
+            print(f"{'번호':<4} {'프로젝트명':<30} {'프로젝트 ID':<36}")
+            print("-" * 70)
+
+            for idx, project in enumerate(all_projects, 1):
+                print(f"{idx:<4} {project.name:<30} {project.id:<36}")
+
+            return all_projects
         except Exception as e:
             self.logger.error(f"프로젝트 목록 조회 실패: {str(e)}")
             raise
@@ -329,24 +1013,155 @@ class TableauMigrationWorker:
             self.logger.error(f"프로젝트 설정 실패: {str(e)}")
             raise
 
+
+def run_migration_mode(worker, mode, multi_site=False, resume=False):
+    """'all'/'updated' 마이그레이션 실행 - 실행 자체가 실패했거나 실패한 항목이 있으면 False"""
+    if multi_site:
+        site_results = worker.run(mode, resume=resume)
+        return not any(results is None or results.count('failed') > 0 for results in site_results.values())
+    migrate = worker.migrate_all_datasources if mode == 'all' else worker.migrate_updated_datasources
+    results = migrate(resume=resume)
+    return results is not None and results.count('failed') == 0
+
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
-    parser.add_argument('--mode', choices=['all', 'updated', 'list-projects', 'select-project'], required=True)
+    parser.add_argument('--mode', choices=['all', 'updated', 'plan', 'daemon', 'list-projects', 'select-project'],
+                        required=True)
+    parser.add_argument('--plan-for', choices=['all', 'updated'], default='all',
+                        help='plan 모드에서 계획을 계산할 실행 종류')
     parser.add_argument('--number', type=int, help='프로젝트 번호')
+    parser.add_argument('--workers', type=int, help='다운로드/업로드 동시 작업 수')
+    parser.add_argument('--download-workers', type=int, help='다운로드 동시 작업 수 (--workers 보다 우선)')
+    parser.add_argument('--upload-workers', type=int, help='업로드 동시 작업 수 (--workers 보다 우선)')
+    parser.add_argument('--page-size', type=int, help='데이터 원본 목록 조회 페이지 크기')
+    parser.add_argument('--resume', action='store_true', help='중단된 이전 실행을 이어서 진행')
+    parser.add_argument('--force-republish', action='store_true',
+                        help='내용이 마지막 게시와 같아도 건너뛰지 않고 다시 게시')
+    parser.add_argument('--report-dir', help='JSON/CSV 실행 리포트를 저장할 폴더')
+    parser.add_argument('--content-types',
+                        help="마이그레이션할 콘텐츠 유형 (예: 'datasource,workbook,flow', 기본값 datasource)")
+    parser.add_argument('--transfer-mode', choices=['file', 'stream'],
+                        help='file: 다운로드 폴더 경유, stream: 다운로드 응답을 Cloud로 바로 전송')
+    parser.add_argument('--site-mapping', help='여러 사이트/프로젝트를 매핑한 JSON 파일 (SITE_MAPPING_PATH)')
+    parser.add_argument('--site-workers', type=int, help='동시에 마이그레이션할 사이트 수')
+    parser.add_argument('--schedule-order', choices=['listed', 'small-first', 'largest-first'],
+                        help='마이그레이션 순서 (우선순위 규칙 다음으로 적용)')
+    parser.add_argument('--priority-rules', help="우선순위 규칙 (예: 'tag:critical=100,project:Finance/*=50')")
+    parser.add_argument('--deadline-minutes', type=float,
+                        help='실행 시작 후 이 시간(분)이 지나면 남은 항목을 다음 실행으로 미룸')
+    parser.add_argument('--daemon-schedule', help="daemon 모드 실행 일정 (예: '15m', '1h', '0 */4 * * *')")
+    parser.add_argument('--daemon-mode', choices=['all', 'updated'], help='daemon 모드에서 회차마다 실행할 마이그레이션')
+    parser.add_argument('--metrics-port', type=int, help='실행 중 Prometheus 지표를 노출할 HTTP 포트')
+    parser.add_argument('--metrics-textfile', help='종료 시 Prometheus 지표를 저장할 textfile 경로')
     args = parser.parse_args()
-    
-    worker = TableauMigrationWorker()
-    
-    if args.mode == 'all':
-        worker.migrate_all_datasources()
-    elif args.mode == 'updated':
-        worker.migrate_updated_datasources()
-    elif args.mode == 'list-projects':
-        worker.list_cloud_projects()
-    elif args.mode == 'select-project':
-        if not args.number:
-            print("프로젝트 번호가 필요합니다.")
-            sys.exit(1)
-        projects = worker.list_cloud_projects()
-        print(worker.select_and_save_project(args.number, projects))
\ No newline at end of file
+
+    config = Config()
+    if args.workers:
+        config.migration['download_workers'] = args.workers
+        config.migration['upload_workers'] = args.workers
+    if args.download_workers:
+        config.migration['download_workers'] = args.download_workers
+    if args.upload_workers:
+        config.migration['upload_workers'] = args.upload_workers
+    if args.page_size:
+        config.migration['page_size'] = args.page_size
+    if args.content_types:
+        config.migration['content_types'] = args.content_types
+    if args.transfer_mode:
+        config.migration['transfer_mode'] = args.transfer_mode
+    if args.report_dir:
+        config.migration['report_dir'] = args.report_dir
+    if args.force_republish:
+        config.migration['force_republish'] = True
+    if args.site_mapping:
+        config.migration['site_mapping_path'] = args.site_mapping
+    if args.site_workers:
+        config.migration['site_workers'] = args.site_workers
+    if args.schedule_order:
+        config.schedule['order'] = args.schedule_order
+    if args.priority_rules:
+        config.schedule['priority_rules'] = args.priority_rules
+    if args.deadline_minutes is not None:
+        config.schedule['deadline_minutes'] = args.deadline_minutes
+    if args.daemon_schedule:
+        config.daemon['schedule'] = args.daemon_schedule
+    if args.daemon_mode:
+        config.daemon['mode'] = args.daemon_mode
+    if args.metrics_port:
+        config.metrics['port'] = args.metrics_port
+    if args.metrics_textfile:
+        config.metrics['textfile'] = args.metrics_textfile
+
+    # daemon 모드는 /healthz와 함께 같은 포트로 지표를 노출
+    if config.metrics['port'] and args.mode != 'daemon':
+        metrics.start_http_server(config.metrics['port'])
+
+    multi_site = args.mode in ('all', 'updated', 'plan', 'daemon') and config.migration['site_mapping_path']
+    if multi_site:
+        # 매핑 파일의 모든 원본 사이트를 사이트별 워커로 동시에 마이그레이션
+        worker = MultiSiteMigration(
+            config,
+            load_site_mappings(config.migration['site_mapping_path']),
+            TableauMigrationWorker,
+            site_workers=config.migration['site_workers']
+        )
+    else:
+        worker = TableauMigrationWorker(config)
+
+    exit_code = 0
+    try:
+        if multi_site and args.mode == 'plan':
+            site_plans = worker.plan(args.plan_for)
+            if any(plan is None for plan in site_plans.values()):
+                exit_code = 1
+        elif args.mode == 'plan':
+            # 데이터를 전송하지 않고 계획과 예상 비용만 계산
+            if worker.plan_migration(args.plan_for) is None:
+                exit_code = 1
+        elif args.mode == 'daemon':
+            # 워커를 유지한 채 일정에 따라 반복 실행 - SIGTERM을 받으면 진행 중인 회차가 끝난 뒤 종료
+            def run_cycle():
+                worker.begin_cycle()
+                return run_migration_mode(worker, config.daemon['mode'], multi_site, resume=args.resume)
+
+            def after_cycle():
+                if config.metrics['textfile']:
+                    metrics.write_textfile(config.metrics['textfile'])
+
+            daemon = MigrationDaemon(
+                run_cycle,
+                parse_schedule(config.daemon['schedule']),
+                lock=RunLock(config.daemon['lock_path']),
+                run_on_start=config.daemon['run_on_start'],
+                after_cycle=after_cycle
+            )
+            signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+            if config.metrics['port']:
+                start_health_server(daemon, config.metrics['port'])
+            daemon.run_forever()
+        elif args.mode in ('all', 'updated'):
+            try:
+                with RunLock(config.daemon['lock_path']):
+                    succeeded = run_migration_mode(worker, args.mode, multi_site, resume=args.resume)
+            except RunLocked as e:
+                print(f"이미 실행 중인 마이그레이션이 있어 종료합니다: {str(e)}")
+                succeeded = False
+            # 실행 자체가 실패했거나 실패한 항목이 있으면 cron/스케줄러가 알 수 있도록 0이 아닌 코드로 종료
+            if not succeeded:
+                exit_code = 1
+        elif args.mode == 'list-projects':
+            worker.list_cloud_projects()
+        elif args.mode == 'select-project':
+            if not args.number:
+                print("프로젝트 번호가 필요합니다.")
+                sys.exit(1)
+            # list-projects 실행에서 저장한 캐시를 재사용하므로 번호 순서가 동일함
+            projects = worker.project_cache().projects()
+            print(worker.select_and_save_project(args.number, projects))
+    finally:
+        worker.close()
+        if config.metrics['textfile']:
+            metrics.write_textfile(config.metrics['textfile'])
+    sys.exit(exit_code)
@@ -0,0 +1,95 @@
+"""마이그레이션 Prometheus 지표
+
+모든 지표는 전용 레지스트리(REGISTRY)에 등록되며, 실행 중에는 start_http_server로 노출하거나
+cron 실행처럼 짧게 끝나는 경우 종료 시 write_textfile로 node_exporter textfile 수집기용 파일을 남깁니다.
+"""
+import logging
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, write_to_textfile
+from prometheus_client import start_http_server as _start_http_server
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = CollectorRegistry()
+
+# 요청 지연 시간 버킷 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# 다운로드/게시 시간 버킷 (초) - 대용량 추출은 수십 분까지 걸릴 수 있음
+TRANSFER_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 3600)
+# 데이터 원본 크기 버킷 (바이트)
+SIZE_BUCKETS = tuple(mb * 1024 * 1024 for mb in (1, 10, 64, 256, 1024, 4096, 16384))
+
+SIGN_IN_SECONDS = Histogram(
+    'tableau_migration_sign_in_seconds', 'Sign-in latency per site',
+    ['site'], buckets=LATENCY_BUCKETS, registry=REGISTRY)
+REAUTHENTICATIONS = Counter(
+    'tableau_migration_reauthentications_total', 'Sessions re-authenticated after expiry or 401',
+    ['site'], registry=REGISTRY)
+LIST_PAGE_SECONDS = Histogram(
+    'tableau_migration_list_page_seconds', 'Latency of one list page request',
+    ['endpoint'], buckets=LATENCY_BUCKETS, registry=REGISTRY)
+DETAIL_FETCH_SECONDS = Histogram(
+    'tableau_migration_detail_fetch_seconds', 'Latency of get_by_id detail requests',
+    ['endpoint'], buckets=LATENCY_BUCKETS, registry=REGISTRY)
+DOWNLOAD_SECONDS = Histogram(
+    'tableau_migration_download_seconds', 'Duration of one content download',
+    ['content_type'], buckets=TRANSFER_BUCKETS, registry=REGISTRY)
+PUBLISH_SECONDS = Histogram(
+    'tableau_migration_publish_seconds', 'Duration of one publish including chunk uploads',
+    ['content_type', 'method'], buckets=TRANSFER_BUCKETS, registry=REGISTRY)
+CHUNK_UPLOAD_SECONDS = Histogram(
+    'tableau_migration_chunk_upload_seconds', 'Duration of one upload session chunk append',
+    buckets=LATENCY_BUCKETS, registry=REGISTRY)
+CONTENT_BYTES = Histogram(
+    'tableau_migration_content_bytes', 'Size of each transferred content file',
+    ['content_type'], buckets=SIZE_BUCKETS, registry=REGISTRY)
+TRANSFERRED_BYTES = Counter(
+    'tableau_migration_transferred_bytes_total', 'Bytes downloaded from Server and uploaded to Cloud',
+    ['direction'], registry=REGISTRY)
+QUEUE_DEPTH = Gauge(
+    'tableau_migration_upload_queue_depth', 'Downloaded items waiting for an upload worker',
+    registry=REGISTRY)
+IN_PROGRESS = Gauge(
+    'tableau_migration_in_progress', 'Items currently being downloaded or uploaded',
+    ['stage'], registry=REGISTRY)
+THROTTLED = Counter(
+    'tableau_migration_throttled_total', 'Throttling responses (429/503) per site',
+    ['site'], registry=REGISTRY)
+CONCURRENCY_LIMIT = Gauge(
+    'tableau_migration_concurrency_limit', 'Current adaptive concurrency limit per site',
+    ['site'], registry=REGISTRY)
+RETRIES = Counter(
+    'tableau_migration_retries_total', 'Retried operations',
+    ['operation'], registry=REGISTRY)
+OUTCOMES = Counter(
+    'tableau_migration_items_total', 'Migrated items by outcome',
+    ['content_type', 'status'], registry=REGISTRY)
+RUN_SECONDS = Gauge(
+    'tableau_migration_last_run_seconds', 'Wall time of the last run',
+    ['mode'], registry=REGISTRY)
+RUN_FINISHED = Gauge(
+    'tableau_migration_last_run_finished_timestamp_seconds', 'Unix time the last run finished',
+    ['mode', 'status'], registry=REGISTRY)
+
+DAEMON_NEXT_RUN = Gauge(
+    'tableau_migration_daemon_next_run_timestamp_seconds', 'Unix time of the next scheduled daemon run',
+    registry=REGISTRY)
+DAEMON_SKIPPED_RUNS = Counter(
+    'tableau_migration_daemon_skipped_runs_total', 'Scheduled daemon runs skipped because another run held the lock',
+    registry=REGISTRY)
+
+
+def start_http_server(port, addr='0.0.0.0'):
+    """/metrics HTTP 엔드포인트를 백그라운드 스레드로 시작"""
+    _start_http_server(port, addr=addr, registry=REGISTRY)
+    logger.info(f"Serving metrics on {addr}:{port}")
+
+
+def write_textfile(path):
+    """node_exporter textfile 수집기용 파일로 현재 지표 저장 (원자적으로 교체)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    write_to_textfile(path, REGISTRY)
+    logger.info(f"Wrote metrics to {path}")
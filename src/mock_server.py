@@ -0,0 +1,402 @@
+"""Tableau REST API를 흉내 내는 로컬 모의 서버
+
+TableauMigrationWorker가 사용하는 엔드포인트(로그인, 데이터 원본 목록/조회/다운로드, 프로젝트 목록,
+파일 업로드 세션, 게시)만 구현합니다. 실제 Tableau Server/Cloud 없이 마이그레이션 처리량을 측정하기 위한
+용도이며, 지연 시간, 대역폭, 페이지 크기, 실패율, 합성 파일 크기를 설정할 수 있습니다.
+
+    python src/mock_server.py --port 8900 --datasources 500 --latency 0.02
+"""
+import argparse
+import hashlib
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from xml.sax.saxutils import quoteattr
+
+NAMESPACE = 'http://tableau.com/api'
+REST_API_VERSION = '3.19'
+_BLOCK_SIZE = 64 * 1024
+_CHUNK_SIZE = 64 * 1024
+
+
+def _timestamp(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _attrs(**values):
+    return ' '.join(f'{name}={quoteattr(str(value))}' for name, value in values.items() if value is not None)
+
+
+class MockTableauServer:
+    """모의 Tableau REST 서버 - 하나의 인스턴스가 원본(Server)과 대상(Cloud) 사이트를 모두 제공
+
+    Args:
+        datasource_count: 원본 데이터 원본 수
+        project_count: 프로젝트 수 (첫 번째 프로젝트 ID는 target_project_id)
+        file_size: 데이터 원본 파일 크기 (바이트)
+        file_size_jitter: 파일 크기 변동 비율 (0.5면 ±50%)
+        latency: 요청마다 추가되는 지연 시간 (초)
+        bandwidth: 다운로드/업로드 전송 속도 제한 (바이트/초, None이면 무제한)
+        max_page_size: 목록 API 최대 페이지 크기
+        failure_rate: 데이터 엔드포인트가 500을 반환할 확률
+        throttle_rate: 데이터 엔드포인트가 429(Retry-After)를 반환할 확률
+        updated_ratio: 최근(1시간 이내) 수정된 데이터 원본 비율
+    """
+
+    def __init__(self, datasource_count=100, project_count=5, file_size=1024 * 1024, file_size_jitter=0.0,
+                 latency=0.0, bandwidth=None, max_page_size=1000, failure_rate=0.0, throttle_rate=0.0,
+                 updated_ratio=0.1, seed=0):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.max_page_size = max_page_size
+        self.failure_rate = failure_rate
+        self.throttle_rate = throttle_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+        now = datetime.now(timezone.utc)
+        self.projects = [
+            {'id': str(uuid.UUID(int=self._random.getrandbits(128))), 'name': f"Project {i:03d}", 'parent_id': None}
+            for i in range(max(1, project_count))
+        ]
+        self.target_project_id = self.projects[0]['id']
+
+        self.datasources = []
+        for i in range(datasource_count):
+            recent = self._random.random() < updated_ratio
+            updated_at = now - (timedelta(hours=1) if recent else timedelta(days=30))
+            jitter = 1 + self._random.uniform(-file_size_jitter, file_size_jitter)
+            project = self.projects[i % len(self.projects)]
+            self.datasources.append({
+                'id': str(uuid.UUID(int=self._random.getrandbits(128))),
+                'name': f"Datasource {i:05d}",
+                'project_id': project['id'],
+                'project_name': project['name'],
+                'owner_id': 'owner-0001',
+                'created_at': now - timedelta(days=365),
+                'updated_at': updated_at,
+                'size': max(4, int(file_size * jitter)),
+            })
+        self._datasources_by_id = {ds['id']: ds for ds in self.datasources}
+
+        self.tokens = {}
+        self.upload_sessions = {}
+        self.published = {}
+        self.stats = Counter()
+
+    # 수명 주기
+
+    def start(self, host='127.0.0.1', port=0):
+        """백그라운드 스레드에서 서버를 시작하고 기본 URL을 반환"""
+        handler = type('MockTableauHandler', (_Handler,), {'mock': self})
+        self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='mock-tableau', daemon=True)
+        self._thread.start()
+        return self.url
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = Counter()
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    # 합성 데이터
+
+    def content_chunks(self, datasource):
+        """데이터 원본 파일 내용 (zip 시그니처로 시작하는 결정적 바이트열)을 청크 단위로 생성"""
+        seed = f"{datasource['id']}:{_timestamp(datasource['updated_at'])}".encode()
+        block = bytearray()
+        while len(block) < _BLOCK_SIZE:
+            seed = hashlib.sha256(seed).digest()
+            block.extend(seed)
+        block = b'PK\x03\x04' + bytes(block[4:_BLOCK_SIZE])
+
+        remaining = datasource['size']
+        while remaining > 0:
+            chunk = block[:min(_CHUNK_SIZE, remaining)]
+            remaining -= len(chunk)
+            yield chunk
+
+    def throttle(self, size):
+        if self.bandwidth:
+            time.sleep(size / self.bandwidth)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    mock = None
+
+    _ROUTES = [
+        ('GET', r'/api/[\d.]+/serverInfo$', '_server_info'),
+        ('POST', r'/api/[\d.]+/auth/signin$', '_sign_in'),
+        ('POST', r'/api/[\d.]+/auth/signout$', '_sign_out'),
+        ('GET', r'/api/[\d.]+/sites/([^/]+)/datasources$', '_list_datasources'),
+        ('GET', r'/api/[\d.]+/sites/([^/]+)/datasources/([^/]+)$', '_get_datasource'),
+        ('GET', r'/api/[\d.]+/sites/([^/]+)/datasources/([^/]+)/content$', '_download_datasource'),
+        ('POST', r'/api/[\d.]+/sites/([^/]+)/datasources$', '_publish_datasource'),
+        ('GET', r'/api/[\d.]+/sites/([^/]+)/projects$', '_list_projects'),
+        ('POST', r'/api/[\d.]+/sites/([^/]+)/projects$', '_create_project'),
+        ('POST', r'/api/[\d.]+/sites/([^/]+)/fileUploads$', '_initiate_upload'),
+        ('PUT', r'/api/[\d.]+/sites/([^/]+)/fileUploads/([^/]+)$', '_append_upload'),
+    ]
+    _UNAUTHENTICATED = {'_server_info', '_sign_in'}
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    # 요청 처리
+
+    def _dispatch(self, method):
+        mock = self.mock
+        parsed = urlparse(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        body_length = int(self.headers.get('Content-Length') or 0)
+        self.body = self.rfile.read(body_length) if body_length else b''
+
+        mock.count('requests')
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        for route_method, pattern, handler_name in self._ROUTES:
+            match = re.match(pattern, parsed.path)
+            if route_method != method or not match:
+                continue
+            mock.count(f"requests.{handler_name.lstrip('_')}")
+
+            if handler_name not in self._UNAUTHENTICATED:
+                token = self.headers.get('x-tableau-auth')
+                if token not in mock.tokens:
+                    return self._error(401, '401002', 'Unauthorized Access',
+                                       'Invalid authentication credentials were provided.')
+                if handler_name != '_sign_out':
+                    roll = mock._random.random()
+                    if roll < mock.throttle_rate:
+                        mock.count('throttled')
+                        return self._send(429, b'Too Many Requests', 'text/plain', {'Retry-After': '1'})
+                    if roll < mock.throttle_rate + mock.failure_rate:
+                        mock.count('failures')
+                        return self._send(500, b'Internal Server Error', 'text/plain')
+
+            return getattr(self, handler_name)(*match.groups())
+
+        return self._error(404, '404000', 'Resource Not Found', f"{method} {parsed.path}")
+
+    def _send(self, status, body, content_type='application/xml', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _xml(self, inner, status=200):
+        body = f'<?xml version="1.0" encoding="UTF-8"?><tsResponse xmlns="{NAMESPACE}">{inner}</tsResponse>'
+        self._send(status, body.encode('utf-8'))
+
+    def _error(self, status, code, summary, detail):
+        self._xml(f'<error code="{code}"><summary>{summary}</summary><detail>{detail}</detail></error>', status)
+
+    def _pagination(self, items):
+        page_number = int(self.query.get('pageNumber', 1))
+        page_size = min(int(self.query.get('pageSize', 100)), self.mock.max_page_size)
+        start = (page_number - 1) * page_size
+        page = items[start:start + page_size]
+        pagination = f'<pagination {_attrs(pageNumber=page_number, pageSize=page_size, totalAvailable=len(items))}/>'
+        return page, pagination
+
+    def _datasource_xml(self, ds):
+        return (
+            f'<datasource {_attrs(id=ds["id"], name=ds["name"], contentUrl=ds["name"].replace(" ", ""), type="hyper", createdAt=_timestamp(ds["created_at"]), updatedAt=_timestamp(ds["updated_at"]), size=ds.get("size"))}>'
+            f'<project {_attrs(id=ds["project_id"], name=ds.get("project_name"))}/>'
+            f'<owner {_attrs(id=ds["owner_id"])}/><tags/></datasource>'
+        )
+
+    # 엔드포인트
+
+    def _server_info(self):
+        self._xml(f'<serverInfo><productVersion build="20231.0.0">2023.1</productVersion>'
+                  f'<restApiVersion>{REST_API_VERSION}</restApiVersion></serverInfo>')
+
+    def _sign_in(self):
+        match = re.search(rb'contentUrl="([^"]*)"', self.body)
+        site = match.group(1).decode() if match else ''
+        token = uuid.uuid4().hex
+        site_id = f"site-{site or 'default'}"
+        self.mock.tokens[token] = site_id
+        self.mock.count('sign_ins')
+        self._xml(f'<credentials token="{token}"><site {_attrs(id=site_id, contentUrl=site)}/>'
+                  f'<user id="user-0001"/></credentials>')
+
+    def _sign_out(self):
+        self.mock.tokens.pop(self.headers.get('x-tableau-auth'), None)
+        self._send(204, b'')
+
+    def _list_datasources(self, site_id):
+        datasources = self.mock.datasources
+        for expression in filter(None, self.query.get('filter', '').split(',')):
+            field, operator, value = expression.split(':', 2)
+            if field != 'updatedAt' or operator not in ('gt', 'gte'):
+                return self._error(400, '400065', 'Bad Request', f"Unsupported filter {expression}")
+            cutoff = datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+            if operator == 'gte':
+                datasources = [ds for ds in datasources if ds['updated_at'] >= cutoff]
+            else:
+                datasources = [ds for ds in datasources if ds['updated_at'] > cutoff]
+
+        page, pagination = self._pagination(datasources)
+        self._xml(pagination + '<datasources>' + ''.join(self._datasource_xml(ds) for ds in page) + '</datasources>')
+
+    def _get_datasource(self, site_id, datasource_id):
+        ds = self.mock._datasources_by_id.get(datasource_id)
+        if ds is None:
+            return self._error(404, '404011', 'Resource Not Found', f"Datasource {datasource_id} not found")
+        self._xml(self._datasource_xml(ds))
+
+    def _download_datasource(self, site_id, datasource_id):
+        ds = self.mock._datasources_by_id.get(datasource_id)
+        if ds is None:
+            return self._error(404, '404011', 'Resource Not Found', f"Datasource {datasource_id} not found")
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Disposition', f'attachment; filename="{ds["name"]}.tdsx"')
+        self.send_header('Content-Length', str(ds['size']))
+        self.end_headers()
+        for chunk in self.mock.content_chunks(ds):
+            self.mock.throttle(len(chunk))
+            self.wfile.write(chunk)
+            self.mock.count('bytes_downloaded', len(chunk))
+
+    def _list_projects(self, site_id):
+        page, pagination = self._pagination(self.mock.projects)
+        projects = ''.join(
+            f'<project {_attrs(id=p["id"], name=p["name"], parentProjectId=p["parent_id"], contentPermissions="ManagedByOwner")}/>'
+            for p in page
+        )
+        self._xml(pagination + f'<projects>{projects}</projects>')
+
+    def _create_project(self, site_id):
+        name_match = re.search(rb'<project[^>]*\sname="([^"]*)"', self.body)
+        parent_match = re.search(rb'<project[^>]*\sparentProjectId="([^"]*)"', self.body)
+        project = {
+            'id': str(uuid.uuid4()),
+            'name': name_match.group(1).decode() if name_match else 'Untitled',
+            'parent_id': parent_match.group(1).decode() if parent_match else None
+        }
+        with self.mock._lock:
+            if any(p['name'] == project['name'] and p['parent_id'] == project['parent_id'] for p in self.mock.projects):
+                return self._error(409, '409006', 'Conflict', f"Project {project['name']} already exists")
+            self.mock.projects.append(project)
+        self.mock.count('projects_created')
+        self._xml(f'<project {_attrs(id=project["id"], name=project["name"], parentProjectId=project["parent_id"])}/>', 201)
+
+    def _initiate_upload(self, site_id):
+        upload_id = uuid.uuid4().hex
+        self.mock.upload_sessions[upload_id] = 0
+        self._xml(f'<fileUpload uploadSessionId="{upload_id}" fileSize="0"/>', 201)
+
+    def _append_upload(self, site_id, upload_id):
+        if upload_id not in self.mock.upload_sessions:
+            return self._error(404, '404017', 'Resource Not Found', f"Upload session {upload_id} not found")
+        self.mock.throttle(len(self.body))
+        self.mock.upload_sessions[upload_id] += len(self.body)
+        self.mock.count('bytes_uploaded', len(self.body))
+        size_mb = self.mock.upload_sessions[upload_id] // (1024 * 1024)
+        self._xml(f'<fileUpload uploadSessionId="{upload_id}" fileSize="{size_mb}"/>')
+
+    def _publish_datasource(self, site_id):
+        upload_id = self.query.get('uploadSessionId')
+        if upload_id:
+            if self.mock.upload_sessions.pop(upload_id, None) is None:
+                return self._error(404, '404017', 'Resource Not Found', f"Upload session {upload_id} not found")
+        else:
+            self.mock.throttle(len(self.body))
+            self.mock.count('bytes_uploaded', len(self.body))
+
+        name_match = re.search(rb'<datasource[^>]*\sname="([^"]*)"', self.body)
+        project_match = re.search(rb'<project[^>]*\sid="([^"]*)"', self.body)
+        name = name_match.group(1).decode() if name_match else 'Untitled'
+        project_id = project_match.group(1).decode() if project_match else self.mock.target_project_id
+
+        key = (project_id, name)
+        overwrite = self.query.get('overwrite') == 'true'
+        if key in self.mock.published and not overwrite:
+            return self._error(409, '409005', 'Conflict', f"Datasource {name} already exists")
+        datasource_id = self.mock.published.setdefault(key, str(uuid.uuid4()))
+        self.mock.count('publishes')
+
+        now = datetime.now(timezone.utc)
+        ds = {'id': datasource_id, 'name': name, 'project_id': project_id, 'owner_id': 'user-0001',
+              'created_at': now, 'updated_at': now}
+        self._xml(self._datasource_xml(ds), 201)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='모의 Tableau REST 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--datasources', type=int, default=100, help='원본 데이터 원본 수')
+    parser.add_argument('--projects', type=int, default=5, help='프로젝트 수')
+    parser.add_argument('--file-size-kb', type=int, default=1024, help='데이터 원본 파일 크기 (KB)')
+    parser.add_argument('--latency', type=float, default=0.0, help='요청별 지연 시간 (초)')
+    parser.add_argument('--bandwidth-mbps', type=float, help='전송 속도 제한 (MB/s)')
+    parser.add_argument('--max-page-size', type=int, default=1000, help='목록 API 최대 페이지 크기')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='500 응답 확률')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='429 응답 확률')
+    args = parser.parse_args()
+
+    mock = MockTableauServer(
+        datasource_count=args.datasources,
+        project_count=args.projects,
+        file_size=args.file_size_kb * 1024,
+        latency=args.latency,
+        bandwidth=args.bandwidth_mbps * 1024 * 1024 if args.bandwidth_mbps else None,
+        max_page_size=args.max_page_size,
+        failure_rate=args.failure_rate,
+        throttle_rate=args.throttle_rate
+    )
+    url = mock.start(args.host, args.port)
+    print(f"모의 Tableau 서버 실행 중: {url}")
+    print(f"대상 프로젝트 ID: {mock.target_project_id}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        mock.stop()
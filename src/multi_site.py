@@ -0,0 +1,118 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from chunked_upload import BYTES_PER_MB
+from planner import format_duration
+
+
+class MultiSiteMigration:
+    """사이트 매핑 파일의 모든 원본 사이트를 한 프로세스에서 마이그레이션
+
+    사이트마다 TableauMigrationWorker를 하나씩 두고 최대 site_workers개 사이트를 동시에 처리합니다.
+    워커(세션 풀, 프로젝트 캐시, 상태 저장소)는 close() 전까지 유지되므로
+    같은 객체로 여러 번 실행하면 로그인과 프로젝트 목록 조회를 다시 하지 않습니다.
+    """
+
+    def __init__(self, config, mappings, worker_factory, site_workers=2):
+        """
+        Args:
+            config: 기본 Config (사이트별 설정은 config.for_site로 생성)
+            mappings: site_mapping.SiteMapping 목록
+            worker_factory: 사이트 설정을 받아 워커를 만드는 함수 (TableauMigrationWorker)
+            site_workers: 동시에 처리할 사이트 수
+        """
+        self.config = config
+        self.mappings = mappings
+        self.site_workers = max(1, site_workers)
+        self.logger = logging.getLogger(__name__)
+        self._worker_factory = worker_factory
+        self._workers = {}
+        self._lock = threading.Lock()
+
+    def worker(self, mapping):
+        """원본 사이트별 워커 (최초 사용 시 생성)"""
+        with self._lock:
+            worker = self._workers.get(mapping.source_site)
+            if worker is None:
+                worker = self._worker_factory(self.config.for_site(mapping))
+                self._workers[mapping.source_site] = worker
+            return worker
+
+    def _run_site(self, mapping, mode, action):
+        worker = self.worker(mapping)
+        self.logger.info(f"Running {mode} for site {mapping.source_site} -> {mapping.target_site}")
+        try:
+            return action(worker)
+        except Exception as e:
+            self.logger.error(f"Failed to run {mode} for site {mapping.source_site}: {str(e)}")
+            return None
+
+    def _each_site(self, mode, action):
+        """모든 사이트 워커에 action을 동시에 실행 - 원본 사이트별 결과(실패한 사이트는 None) 반환"""
+        with ThreadPoolExecutor(max_workers=self.site_workers, thread_name_prefix='site') as executor:
+            futures = {
+                mapping.source_site: executor.submit(self._run_site, mapping, mode, action)
+                for mapping in self.mappings
+            }
+            return {site: future.result() for site, future in futures.items()}
+
+    def begin_cycle(self):
+        """daemon 모드의 다음 실행 준비 - 모든 사이트 워커의 실행 단위 상태 초기화"""
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.begin_cycle()
+
+    def run(self, mode, resume=False):
+        """모든 사이트 마이그레이션 - 원본 사이트별 MigrationResults(실패한 사이트는 None) 반환"""
+        def migrate(worker):
+            if mode == 'all':
+                return worker.migrate_all_datasources(resume=resume)
+            return worker.migrate_updated_datasources(resume=resume)
+
+        site_results = self._each_site(mode, migrate)
+        self.print_summary(site_results)
+        return site_results
+
+    def plan(self, basis='all'):
+        """모든 사이트의 마이그레이션 계획 - 원본 사이트별 MigrationPlan(실패한 사이트는 None) 반환"""
+        site_plans = self._each_site('plan', lambda worker: worker.plan_migration(basis))
+        self.print_plan_summary(site_plans)
+        return site_plans
+
+    def print_summary(self, site_results):
+        print("\n사이트별 마이그레이션 결과:")
+        print(f"{'원본 사이트':<20} {'대상 사이트':<20} {'대상':>6} {'성공':>6} {'실패':>6} {'변경 없음':>9} {'건너뜀':>6} {'미룸':>6}")
+        print("-" * 89)
+        for mapping in self.mappings:
+            results = site_results.get(mapping.source_site)
+            if results is None:
+                print(f"{mapping.source_site:<20} {mapping.target_site:<20} {'실행 실패':>6}")
+                continue
+            print(f"{mapping.source_site:<20} {mapping.target_site:<20} {results.queued:>6} "
+                  f"{results.count('success'):>6} {results.count('failed'):>6} "
+                  f"{results.count('unchanged'):>9} {results.count('skipped'):>6} {results.count('deferred'):>6}")
+
+    def print_plan_summary(self, site_plans):
+        print("\n사이트별 마이그레이션 계획:")
+        print(f"{'원본 사이트':<20} {'대상 사이트':<20} {'생성':>6} {'덮어쓰기':>8} {'건너뜀':>6} "
+              f"{'새 프로젝트':>10} {'전송량(MB)':>10} {'예상 시간':>10}")
+        print("-" * 100)
+        for mapping in self.mappings:
+            plan = site_plans.get(mapping.source_site)
+            if plan is None:
+                print(f"{mapping.source_site:<20} {mapping.target_site:<20} {'계획 실패':>6}")
+                continue
+            estimated = plan.estimated_seconds()
+            estimated = format_duration(estimated) if estimated is not None else '?'
+            print(f"{mapping.source_site:<20} {mapping.target_site:<20} {plan.count('create'):>6} "
+                  f"{plan.count('overwrite'):>8} {plan.count('skip'):>6} {plan.count('create_project'):>10} "
+                  f"{plan.total_bytes() / BYTES_PER_MB:>10.1f} {estimated:>10}")
+
+    def close(self):
+        """모든 사이트 워커의 세션 로그아웃과 상태 저장소 정리"""
+        with self._lock:
+            workers, self._workers = list(self._workers.values()), {}
+        for worker in workers:
+            worker.close()
@@ -0,0 +1,141 @@
+import logging
+import queue
+import threading
+import time
+
+import metrics
+
+_DONE = object()
+
+
+def _elapsed(started):
+    return round(time.monotonic() - started, 3)
+
+
+class MigrationPipeline:
+    """Tableau Server 다운로드와 Tableau Cloud 업로드를 겹쳐 실행하는 파이프라인
+
+    다운로드 워커가 받은 파일을 크기가 제한된 큐에 넣고, 업로드 워커가 큐에서 꺼내 게시합니다.
+    큐가 가득 차면 다운로드가 대기하므로 디스크에 동시에 쌓이는 파일 수가 제한됩니다.
+    skip_fn(item, downloaded)이 사유를 반환하면 업로드 없이 'skipped' 결과로 처리합니다.
+    결과에는 항목별 다운로드/업로드 소요 시간(초)이 함께 기록됩니다.
+    """
+
+    def __init__(self, download_fn, upload_fn, cleanup_fn=None, skip_fn=None,
+                 download_workers=1, upload_workers=1, queue_size=None):
+        self.download_fn = download_fn
+        self.upload_fn = upload_fn
+        self.cleanup_fn = cleanup_fn
+        self.skip_fn = skip_fn
+        self.download_workers = max(1, download_workers)
+        self.upload_workers = max(1, upload_workers)
+        self.queue_size = queue_size or self.upload_workers * 2
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, items, on_result=None):
+        """항목 전체를 처리하고 항목별 결과 목록을 반환
+
+        items는 지연 생성되는 이터러블이어도 되며, 다운로드 워커가 여유가 생길 때마다 하나씩 꺼내 갑니다.
+        on_result는 결과가 나올 때마다 잠금 안에서 호출되므로 별도의 동기화 없이 결과를 집계할 수 있습니다.
+        on_result나 cleanup_fn에서 발생한 예외는 로그로 남기고 다음 항목을 계속 처리합니다.
+        """
+        source = iter(items)
+        source_lock = threading.Lock()
+        result_lock = threading.Lock()
+        upload_queue = queue.Queue(maxsize=self.queue_size)
+        results = []
+        errors = []
+
+        def report(item, status, error=None, output=None, downloaded=None, timings=None):
+            result = {'item': item, 'status': status, 'error': error, 'output': output,
+                      'downloaded': downloaded, 'download_seconds': None, 'upload_seconds': None}
+            result.update(timings or {})
+            with result_lock:
+                results.append(result)
+                if on_result:
+                    # 콜백 오류로 워커 스레드가 죽으면 큐를 비울 업로드 워커가 없어 다운로드가 멈추므로 기록만 하고 계속 진행
+                    try:
+                        on_result(result)
+                    except Exception:
+                        self.logger.exception(f"Result callback failed for {getattr(item, 'name', item)}")
+
+        def cleanup(downloaded):
+            if not self.cleanup_fn:
+                return
+            try:
+                self.cleanup_fn(downloaded)
+            except Exception:
+                self.logger.exception("Cleanup of downloaded file failed")
+
+        def next_item():
+            with source_lock:
+                if errors:
+                    return _DONE
+                try:
+                    return next(source)
+                except StopIteration:
+                    return _DONE
+                except Exception as e:
+                    # 목록 조회 자체가 실패한 경우 - 모든 워커를 멈추고 호출자에게 전달
+                    errors.append(e)
+                    return _DONE
+
+        def download_worker():
+            while True:
+                item = next_item()
+                if item is _DONE:
+                    return
+                started = time.monotonic()
+                try:
+                    with metrics.IN_PROGRESS.labels('download').track_inprogress():
+                        downloaded = self.download_fn(item)
+                except Exception as e:
+                    report(item, 'failed', str(e), timings={'download_seconds': _elapsed(started)})
+                    continue
+                timings = {'download_seconds': _elapsed(started)}
+
+                reason = self.skip_fn(item, downloaded) if self.skip_fn else None
+                if reason:
+                    report(item, 'skipped', output=reason, downloaded=downloaded, timings=timings)
+                    cleanup(downloaded)
+                    continue
+                upload_queue.put((item, downloaded, timings))
+                metrics.QUEUE_DEPTH.set(upload_queue.qsize())
+
+        def upload_worker():
+            while True:
+                entry = upload_queue.get()
+                if entry is _DONE:
+                    return
+                metrics.QUEUE_DEPTH.set(upload_queue.qsize())
+                item, downloaded, timings = entry
+                started = time.monotonic()
+                try:
+                    with metrics.IN_PROGRESS.labels('upload').track_inprogress():
+                        output = self.upload_fn(item, downloaded)
+                    timings['upload_seconds'] = _elapsed(started)
+                    report(item, 'success', output=output, downloaded=downloaded, timings=timings)
+                except Exception as e:
+                    timings['upload_seconds'] = _elapsed(started)
+                    report(item, 'failed', str(e), downloaded=downloaded, timings=timings)
+                finally:
+                    cleanup(downloaded)
+
+        downloaders = [threading.Thread(target=download_worker, name=f"download-{i}", daemon=True)
+                       for i in range(self.download_workers)]
+        uploaders = [threading.Thread(target=upload_worker, name=f"upload-{i}", daemon=True)
+                     for i in range(self.upload_workers)]
+        for thread in downloaders + uploaders:
+            thread.start()
+
+        for thread in downloaders:
+            thread.join()
+        for _ in uploaders:
+            upload_queue.put(_DONE)
+        for thread in uploaders:
+            thread.join()
+        metrics.QUEUE_DEPTH.set(0)
+
+        if errors:
+            raise errors[0]
+        return results
@@ -0,0 +1,228 @@
+"""마이그레이션 계획 (계획 모드)
+
+데이터를 전송하지 않고 'all'/'updated' 실행의 대상 선별 결과를 대상 Cloud 사이트와 비교해
+항목별 작업(create / overwrite / skip, 새 프로젝트는 create_project), 전송량과 예상 소요 시간을 계산합니다.
+
+- 크기: 이전 실행에서 측정한 파일 크기를 우선 사용하고, 없으면 목록 응답의 size 메타데이터를 사용합니다.
+- 예상 시간: 이전에 전송한 항목은 그때 측정한 다운로드/업로드 시간을, 처음 전송하는 항목은
+  과거 실행 전체의 평균 처리량(바이트/초)으로 계산합니다. 파이프라인에서 다운로드와 업로드가 겹쳐
+  진행되므로 전체 시간은 두 단계 중 오래 걸리는 쪽(합계 / 워커 수)으로 추정합니다.
+"""
+import csv
+import json
+import os
+from collections import Counter
+from datetime import datetime, timezone
+
+from chunked_upload import BYTES_PER_MB
+from state_store import to_timestamp
+
+OPERATIONS = ('create_project', 'create', 'overwrite', 'skip')
+
+# 계획 항목 필드 (CSV 열 순서)
+PLAN_FIELDS = [
+    'operation', 'id', 'name', 'content_type', 'project_id', 'target_project_id', 'target_project_path',
+    'target_id', 'reason', 'updated_at', 'bytes', 'size_source',
+    'estimated_download_seconds', 'estimated_upload_seconds', 'depends_on'
+]
+
+
+def throughput(stats):
+    """과거 실행에서 측정한 평균 처리량 (다운로드, 업로드 바이트/초) - 측정 이력이 없으면 None"""
+    if not stats or not stats.get('count') or not stats.get('bytes'):
+        return None
+    if not stats.get('download_seconds') or not stats.get('upload_seconds'):
+        return None
+    return stats['bytes'] / stats['download_seconds'], stats['bytes'] / stats['upload_seconds']
+
+
+def estimate_seconds(size, history=None, rates=None):
+    """항목 하나의 예상 (다운로드, 업로드) 초 - 계산할 수 없으면 (None, None)"""
+    if history and history.get('download_seconds') is not None and history.get('upload_seconds') is not None:
+        return history['download_seconds'], history['upload_seconds']
+    if size is None or rates is None:
+        return None, None
+    return size / rates[0], size / rates[1]
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class MigrationPlan:
+    """한 사이트의 마이그레이션 계획
+
+    rates는 throughput()으로 계산한 과거 처리량이며, 없으면 측정 이력이 있는 항목만 시간을 추정합니다.
+    """
+
+    def __init__(self, basis, download_workers, upload_workers, site=None, rates=None):
+        self.basis = basis
+        self.site = site
+        self.download_workers = max(1, download_workers)
+        self.upload_workers = max(1, upload_workers)
+        self.rates = rates
+        self.created_at = datetime.now(timezone.utc)
+        self._entries = []
+        self._counts = Counter()
+
+    def add_project(self, path):
+        """새로 만들 대상 프로젝트"""
+        self._add({'operation': 'create_project', 'name': path, 'target_project_path': path})
+
+    def add(self, operation, datasource, size=None, size_source='unknown', history=None,
+            content_type='datasource', **fields):
+        """전송할 콘텐츠 (create/overwrite) - 크기와 측정 이력으로 예상 시간을 계산
+
+        depends_on에는 통합 문서/흐름이 연결된 상위 데이터 원본 ID를 ';'로 이어서 기록합니다.
+        """
+        download_seconds, upload_seconds = estimate_seconds(size, history, self.rates)
+        entry = {
+            'operation': operation,
+            'id': datasource.id,
+            'name': datasource.name,
+            'content_type': content_type,
+            'project_id': datasource.project_id,
+            'updated_at': datasource.updated_at,
+            'bytes': size,
+            'size_source': size_source,
+            'estimated_download_seconds': download_seconds,
+            'estimated_upload_seconds': upload_seconds
+        }
+        entry.update(fields)
+        self._add(entry)
+
+    def skip(self, result_entry):
+        """대상이 아닌 항목 (MigrationResults의 skipped 항목)"""
+        self._add({
+            'operation': 'skip',
+            'id': result_entry['id'],
+            'name': result_entry['name'],
+            'content_type': result_entry['content_type'],
+            'project_id': result_entry['project_id'],
+            'updated_at': result_entry['updated_at'],
+            'reason': result_entry['reason']
+        })
+
+    def _add(self, entry):
+        row = dict.fromkeys(PLAN_FIELDS)
+        row.update(entry)
+        self._entries.append(row)
+        self._counts[row['operation']] += 1
+
+    def count(self, operation):
+        return self._counts[operation]
+
+    def entries(self, operation=None):
+        return [dict(entry) for entry in self._entries if operation is None or entry['operation'] == operation]
+
+    def transfers(self):
+        return [entry for entry in self._entries if entry['operation'] in ('create', 'overwrite')]
+
+    def total_bytes(self):
+        return sum(entry['bytes'] or 0 for entry in self.transfers())
+
+    def unknown_sizes(self):
+        return sum(1 for entry in self.transfers() if entry['bytes'] is None)
+
+    def unestimated(self):
+        return sum(1 for entry in self.transfers() if entry['estimated_download_seconds'] is None)
+
+    def estimated_seconds(self):
+        """예상 소요 시간(초) - 전송할 항목이 있는데 하나도 추정할 수 없으면 None"""
+        transfers = self.transfers()
+        if not transfers:
+            return 0.0
+        estimated = [entry for entry in transfers if entry['estimated_download_seconds'] is not None]
+        if not estimated:
+            return None
+        download = sum(entry['estimated_download_seconds'] for entry in estimated) / self.download_workers
+        upload = sum(entry['estimated_upload_seconds'] for entry in estimated) / self.upload_workers
+        return max(download, upload)
+
+    def print_summary(self):
+        if self.count('create_project'):
+            print("\n새로 만들 프로젝트:")
+            for entry in self.entries('create_project'):
+                print(f"+ {entry['name']}")
+
+        transfers = self.transfers()
+        if transfers:
+            print("\n전송할 콘텐츠:")
+            print(f"{'작업':<10} {'이름':<30} {'크기(MB)':>10} {'예상(초)':>9}  대상 프로젝트")
+            print("-" * 90)
+            for entry in transfers:
+                size = f"{entry['bytes'] / BYTES_PER_MB:.1f}" if entry['bytes'] is not None else '?'
+                seconds = entry['estimated_download_seconds']
+                seconds = f"{seconds + entry['estimated_upload_seconds']:.1f}" if seconds is not None else '?'
+                target = entry['target_project_path'] or entry['target_project_id'] or ''
+                name = entry['name'] if entry['content_type'] == 'datasource' \
+                    else f"{entry['name']} [{entry['content_type']}]"
+                print(f"{entry['operation']:<10} {name:<30} {size:>10} {seconds:>9}  {target}")
+
+        print(f"\n마이그레이션 계획 요약 ({self.basis}):")
+        print(f"생성: {self.count('create')}")
+        print(f"덮어쓰기: {self.count('overwrite')}")
+        print(f"건너뜀: {self.count('skip')}")
+        for reason, count in Counter(entry['reason'] for entry in self.entries('skip')).items():
+            print(f"  - {reason}: {count}")
+        print(f"새 프로젝트: {self.count('create_project')}")
+        connected = sum(1 for entry in transfers if entry['depends_on'])
+        if connected:
+            print(f"게시 데이터 원본에 연결된 통합 문서/흐름: {connected} "
+                  f"(연결은 원본 Server를 가리킨 채로 게시되므로 게시 후 Cloud 데이터 원본으로 다시 연결 필요)")
+        unknown = f" (크기 확인 불가 {self.unknown_sizes()}개 제외)" if self.unknown_sizes() else ''
+        print(f"전송량: {self.total_bytes() / BYTES_PER_MB:.1f} MB{unknown}")
+
+        estimated = self.estimated_seconds()
+        if estimated is None:
+            print("예상 소요 시간: 측정된 전송 이력이 없어 계산할 수 없음")
+            return
+        unestimated = f", 추정 불가 {self.unestimated()}개 제외" if self.unestimated() else ''
+        print(f"예상 소요 시간: 약 {format_duration(estimated)} "
+              f"(다운로드 워커 {self.download_workers}, 업로드 워커 {self.upload_workers}{unestimated})")
+        if self.rates:
+            print(f"과거 처리량: 다운로드 {self.rates[0] / BYTES_PER_MB:.1f} MB/s, "
+                  f"업로드 {self.rates[1] / BYTES_PER_MB:.1f} MB/s (워커당)")
+
+    def _report_rows(self):
+        rows = []
+        for entry in self._entries:
+            row = dict(entry)
+            row['updated_at'] = to_timestamp(row['updated_at'])
+            rows.append(row)
+        return rows
+
+    def to_dict(self):
+        estimated = self.estimated_seconds()
+        return {
+            'basis': self.basis,
+            'site': self.site,
+            'created_at': to_timestamp(self.created_at),
+            'counts': {operation: self._counts[operation] for operation in OPERATIONS},
+            'bytes': self.total_bytes(),
+            'unknown_sizes': self.unknown_sizes(),
+            'estimated_seconds': round(estimated, 1) if estimated is not None else None,
+            'unestimated': self.unestimated(),
+            'download_workers': self.download_workers,
+            'upload_workers': self.upload_workers,
+            'throughput': {'download': self.rates[0], 'upload': self.rates[1]} if self.rates else None,
+            'items': self._report_rows()
+        }
+
+    def write_reports(self, report_dir):
+        """JSON(요약 + 항목)과 CSV(항목) 계획을 저장하고 경로 목록을 반환"""
+        os.makedirs(report_dir, exist_ok=True)
+        stamp = self.created_at.strftime('%Y%m%dT%H%M%SZ')
+        base = os.path.join(report_dir, f"plan_{self.basis}_{stamp}")
+
+        json_path = f"{base}.json"
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+        csv_path = f"{base}.csv"
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=PLAN_FIELDS)
+            writer.writeheader()
+            writer.writerows(self._report_rows())
+        return [json_path, csv_path]
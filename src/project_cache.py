@@ -0,0 +1,236 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import tableauserverclient as TSC
+
+from inventory import iter_all_pages
+
+ProjectInfo = namedtuple('ProjectInfo', ['id', 'name', 'parent_id'])
+
+PATH_SEPARATOR = '/'
+
+# 대상 사이트별 프로젝트 생성 잠금 - 사이트 매핑 실행에서 여러 원본 사이트가 같은 대상 사이트를 쓸 때 사용
+_site_locks = {}
+_site_locks_guard = threading.Lock()
+
+
+def _site_lock(site_key):
+    with _site_locks_guard:
+        return _site_locks.setdefault(site_key, threading.Lock())
+
+
+def is_conflict(error):
+    """같은 이름의 항목이 이미 있는 경우(409) 여부"""
+    return str(getattr(error, 'code', '')).startswith('409')
+
+
+def split_path(path):
+    """'상위/하위' 형식의 프로젝트 경로를 이름 목록으로 분리"""
+    return [part.strip() for part in (path or '').split(PATH_SEPARATOR) if part.strip()]
+
+
+def join_path(parts):
+    return PATH_SEPARATOR.join(parts)
+
+
+def project_paths(projects):
+    """프로젝트 ID별 전체 경로(최상위 프로젝트부터 '/'로 연결) 계산"""
+    by_id = {project.id: project for project in projects}
+    paths = {}
+
+    def path_of(project_id, seen=()):
+        if project_id in paths:
+            return paths[project_id]
+        project = by_id[project_id]
+        parent = by_id.get(project.parent_id)
+        # 부모가 목록에 없거나 순환 참조면 최상위로 취급
+        if parent is None or project.parent_id in seen:
+            path = project.name
+        else:
+            path = join_path([path_of(parent.id, seen + (project_id,)), project.name])
+        paths[project_id] = path
+        return path
+
+    for project in projects:
+        path_of(project.id)
+    return paths
+
+
+class ProjectCache:
+    """Tableau Cloud 프로젝트 메타데이터 캐시
+
+    프로젝트 목록은 실행당 한 번 모든 페이지를 조회해 메모리에 보관하고,
+    cache_path가 지정되면 ttl_seconds 동안 디스크에 저장해 다음 실행(예: list-projects 후
+    select-project)에서도 재사용합니다.
+    """
+
+    def __init__(self, pool, site_key, cache_path=None, ttl_seconds=0, page_size=100):
+        self.pool = pool
+        self.site_key = site_key
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.page_size = page_size
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._projects = None
+        self._loaded_at = None
+        self._validated = set()
+
+    def _load_from_disk(self):
+        if not self.cache_path or not self.ttl_seconds or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable project cache {self.cache_path}: {str(e)}")
+            return None
+        if cached.get('site_key') != self.site_key:
+            return None
+        if time.time() - cached.get('fetched_at', 0) > self.ttl_seconds:
+            return None
+        return [ProjectInfo(**project) for project in cached['projects']]
+
+    def _save_to_disk(self, projects):
+        if not self.cache_path or not self.ttl_seconds:
+            return
+        cached = {
+            'site_key': self.site_key,
+            'fetched_at': time.time(),
+            'projects': [project._asdict() for project in projects]
+        }
+        # 같은 캐시 파일을 쓰는 다른 워커/프로세스와 임시 파일이 겹치지 않도록 쓰기마다 새 이름 사용
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        with tempfile.NamedTemporaryFile('w', dir=directory, prefix=f"{os.path.basename(self.cache_path)}.",
+                                         suffix='.tmp', delete=False) as f:
+            json.dump(cached, f)
+        try:
+            os.replace(f.name, self.cache_path)
+        except OSError:
+            os.remove(f.name)
+            raise
+
+    def _fetch(self):
+        projects = [
+            ProjectInfo(p.id, p.name, p.parent_id)
+            for p in iter_all_pages(self.pool, 'projects', page_size=self.page_size)
+        ]
+        self.logger.info(f"Loaded {len(projects)} projects from Tableau Cloud")
+        return projects
+
+    def projects(self, refresh=False):
+        """전체 프로젝트 목록 (메모리 → 디스크 → 서버 순으로 조회)"""
+        with self._lock:
+            if self._projects is None or refresh:
+                projects = None if refresh else self._load_from_disk()
+                if projects is None:
+                    projects = self._fetch()
+                    self._save_to_disk(projects)
+                self._projects = projects
+                self._loaded_at = time.monotonic()
+            return self._projects
+
+    def expire(self, max_age):
+        """메모리의 프로젝트 목록이 max_age초보다 오래되었으면 비워서 다음 사용 시 다시 조회 (daemon 모드용)"""
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at < max_age:
+                return
+            self._projects = None
+            self._loaded_at = None
+            self._validated = set()
+
+    def get(self, project_id):
+        for project in self.projects():
+            if project.id == project_id:
+                return project
+        return None
+
+    def paths(self):
+        """프로젝트 ID별 전체 경로"""
+        return project_paths(self.projects())
+
+    def path_ids(self):
+        """경로별 프로젝트 ID"""
+        return {path: project_id for project_id, path in self.paths().items()}
+
+    def missing_paths(self, paths):
+        """경로 목록을 준비하려면 새로 만들어야 하는 프로젝트 경로 (중간 경로 포함, 상위 단계부터)"""
+        ids = self.path_ids()
+        wanted = set()
+        for path in paths:
+            parts = split_path(path)
+            for depth in range(1, len(parts) + 1):
+                wanted.add(join_path(parts[:depth]))
+        return sorted(wanted - ids.keys(), key=lambda path: (len(split_path(path)), path))
+
+    def ensure_paths(self, paths, workers=4):
+        """경로 목록의 프로젝트를 모두 준비하고 경로별 프로젝트 ID를 반환
+
+        없는 프로젝트(중간 경로 포함)는 상위 단계부터 생성하며, 같은 단계의 프로젝트는 최대 workers개씩
+        동시에 생성합니다. 생성한 프로젝트는 캐시에 추가되므로 다시 조회하지 않습니다.
+
+        같은 대상 사이트의 프로젝트 준비는 프로세스 안에서 한 번에 하나씩 진행하며, 만들 프로젝트가 있으면
+        다른 사이트 워커가 먼저 만들었을 수 있으므로 목록을 다시 조회합니다. 그래도 다른 프로세스와 겹쳐
+        이미 있다는 응답(409)을 받으면 기존 프로젝트의 ID를 사용합니다.
+        """
+        with _site_lock(self.site_key):
+            missing = self.missing_paths(paths)
+            if missing:
+                self.projects(refresh=True)
+                missing = self.missing_paths(paths)
+            ids = self.path_ids()
+            if not missing:
+                return ids
+
+            def create(path):
+                parts = split_path(path)
+                parent_id = ids[join_path(parts[:-1])] if len(parts) > 1 else None
+                item = TSC.ProjectItem(name=parts[-1], parent_id=parent_id)
+                try:
+                    created = self.pool.run(lambda server: server.projects.create(item), operation='create_project')
+                except Exception as e:
+                    existing = self._find_child(parts[-1], parent_id) if is_conflict(e) else None
+                    if existing is None:
+                        raise
+                    self.logger.info(f"Project {path} already exists ({existing.id})")
+                    return path, existing
+                self.logger.info(f"Created project {path} ({created.id})")
+                return path, ProjectInfo(created.id, created.name, parent_id)
+
+            created = []
+            with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='project') as executor:
+                for depth in sorted({len(split_path(path)) for path in missing}):
+                    level = [path for path in missing if len(split_path(path)) == depth]
+                    for path, project in executor.map(create, level):
+                        ids[path] = project.id
+                        created.append(project)
+
+            with self._lock:
+                known = {project.id for project in self._projects or []}
+                self._projects = list(self._projects or []) + [p for p in created if p.id not in known]
+                self._save_to_disk(self._projects)
+            self._validated.update(project.id for project in created)
+            return ids
+
+    def _find_child(self, name, parent_id):
+        """서버에서 parent_id 아래의 name 프로젝트 조회 (생성 충돌 시 기존 프로젝트 확인용)"""
+        for project in self._fetch():
+            if project.name == name and project.parent_id == parent_id:
+                return project
+        return None
+
+    def ensure_exists(self, project_id):
+        """프로젝트 존재 여부를 실행당 한 번만 확인 - 캐시에 없으면 서버에서 한 번 더 확인"""
+        if project_id in self._validated:
+            return
+        if self.get(project_id) is None:
+            self.projects(refresh=True)
+            if self.get(project_id) is None:
+                raise ValueError(f"Project with ID {project_id} does not exist in Tableau Cloud")
+        self._validated.add(project_id)
@@ -0,0 +1,176 @@
+import csv
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+from state_store import to_timestamp
+
+# 대상에 이미 최신 버전이 있어 대상 선별에서 건너뛴 사유 (의존 관계에서는 unchanged와 같음)
+ALREADY_MIGRATED_REASONS = ('up_to_date', 'completed_in_previous_run')
+
+# 원본 Server의 게시 데이터 원본에 연결된 채로 게시되어 Cloud 데이터 원본으로 다시 연결해야 하는 항목의 사유
+RECONNECT_REASON = 'reconnect_published_datasources'
+
+# 리포트 항목 필드 (CSV 열 순서)
+REPORT_FIELDS = [
+    'id', 'name', 'content_type', 'project_id', 'owner_id', 'updated_at', 'status', 'reason', 'error',
+    'bytes', 'download_seconds', 'upload_seconds', 'total_seconds', 'target_id'
+]
+
+
+class MigrationResults:
+    """한 실행의 항목별 마이그레이션 결과
+
+    항목은 원본 ID를 키로 보관하므로 이름이 같은 데이터 원본(다른 프로젝트)도 구분되고,
+    결과 갱신과 상태별 집계가 항목 수와 무관하게 상수 시간에 처리됩니다.
+    파이프라인 워커가 동시에 갱신할 수 있도록 모든 변경은 잠금 안에서 이루어집니다.
+
+    상태: pending(마이그레이션 대기), success, failed, unchanged(내용 변경 없음), skipped(대상 아님/이전 실행에서 완료),
+          deferred(실행 마감 시각이 지나 다음 실행으로 미룸), blocked(연결된 상위 데이터 원본이 마이그레이션되지 않음)
+    """
+
+    def __init__(self, mode, run_id=None):
+        self.mode = mode
+        self.run_id = run_id
+        self.total = 0
+        self.queued = 0
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at = None
+        self._items = {}
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, item, status='pending', reason=None, content_type='datasource'):
+        """목록에서 확인한 항목 등록 - pending 항목은 마이그레이션 대상 수(queued)에 포함"""
+        entry = {
+            'id': item.id,
+            'name': item.name,
+            'content_type': content_type,
+            'project_id': getattr(item, 'project_id', None),
+            'owner_id': getattr(item, 'owner_id', None),
+            'updated_at': item.updated_at,
+            'status': status,
+            'reason': reason,
+            'error': None,
+            'bytes': None,
+            'download_seconds': None,
+            'upload_seconds': None,
+            'total_seconds': None,
+            'target_id': None
+        }
+        with self._lock:
+            previous = self._items.get(item.id)
+            if previous is not None:
+                self._counts[previous['status']] -= 1
+            self._items[item.id] = entry
+            self._counts[status] += 1
+            if status == 'pending':
+                self.queued += 1
+        return entry
+
+    def update(self, item_id, status, **fields):
+        """항목 결과 갱신 (error, bytes, download_seconds, upload_seconds, target_id 등)"""
+        with self._lock:
+            entry = self._items[item_id]
+            self._counts[entry['status']] -= 1
+            self._counts[status] += 1
+            entry['status'] = status
+            entry.update(fields)
+            timings = [entry['download_seconds'], entry['upload_seconds']]
+            if any(t is not None for t in timings):
+                entry['total_seconds'] = round(sum(t for t in timings if t is not None), 3)
+
+    def record(self, result):
+        """MigrationPipeline 결과로 항목 갱신"""
+        item = result['item']
+        downloaded = result['downloaded']
+        published = result['output'] if result['status'] == 'success' else None
+        status = 'unchanged' if result['status'] == 'skipped' else result['status']
+        self.update(
+            item.id, status,
+            reason=result['output'] if result['status'] == 'skipped' else None,
+            error=result['error'],
+            bytes=downloaded.size if downloaded else None,
+            download_seconds=result.get('download_seconds'),
+            upload_seconds=result.get('upload_seconds'),
+            target_id=getattr(published, 'id', None)
+        )
+
+    def dependency_status(self, item_id):
+        """DependencyGate용 상태 - 대상에 이미 최신 버전이 있어 건너뛴 항목은 unchanged로 반환"""
+        with self._lock:
+            entry = self._items.get(item_id)
+            if entry is None:
+                return None
+            if entry['status'] == 'skipped' and entry['reason'] in ALREADY_MIGRATED_REASONS:
+                return 'unchanged'
+            return entry['status']
+
+    def content_type_counts(self):
+        """콘텐츠 유형별 항목 수"""
+        with self._lock:
+            return Counter(entry['content_type'] for entry in self._items.values())
+
+    def count(self, status):
+        with self._lock:
+            return self._counts[status]
+
+    def items(self, status=None):
+        """등록 순서대로 항목 목록 반환 (status 지정 시 해당 상태만)"""
+        with self._lock:
+            return [dict(entry) for entry in self._items.values()
+                    if status is None or entry['status'] == status]
+
+    def slowest(self, limit=5):
+        """전송 시간이 가장 긴 항목"""
+        timed = [entry for entry in self.items() if entry['total_seconds'] is not None]
+        return sorted(timed, key=lambda entry: entry['total_seconds'], reverse=True)[:limit]
+
+    def total_bytes(self):
+        return sum(entry['bytes'] or 0 for entry in self.items()
+                   if entry['status'] in ('success', 'unchanged'))
+
+    def finish(self):
+        self.finished_at = datetime.now(timezone.utc)
+
+    def _report_rows(self):
+        rows = []
+        for entry in self.items():
+            row = dict(entry)
+            row['updated_at'] = to_timestamp(row['updated_at'])
+            rows.append(row)
+        return rows
+
+    def to_dict(self):
+        with self._lock:
+            counts = {status: count for status, count in self._counts.items() if count}
+        return {
+            'mode': self.mode,
+            'run_id': self.run_id,
+            'started_at': to_timestamp(self.started_at),
+            'finished_at': to_timestamp(self.finished_at),
+            'total': self.total,
+            'queued': self.queued,
+            'counts': counts,
+            'bytes': self.total_bytes(),
+            'items': self._report_rows()
+        }
+
+    def write_reports(self, report_dir):
+        """JSON(요약 + 항목)과 CSV(항목) 리포트를 저장하고 경로 목록을 반환"""
+        os.makedirs(report_dir, exist_ok=True)
+        stamp = (self.finished_at or self.started_at).strftime('%Y%m%dT%H%M%SZ')
+        base = os.path.join(report_dir, f"migration_{self.mode}_{stamp}")
+
+        json_path = f"{base}.json"
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+        csv_path = f"{base}.csv"
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(self._report_rows())
+        return [json_path, csv_path]
@@ -0,0 +1,219 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+import requests
+
+import metrics
+from session_pool import is_auth_error
+
+# 재시도할 HTTP 상태 코드 - 429/503은 서버가 요청 속도를 제한하는 신호로 보고 동시 실행 수를 줄임
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
+CONNECTION_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                     requests.exceptions.ChunkedEncodingError)
+
+
+def parse_budgets(value):
+    """'download=50,publish=20' 형식의 작업별 재시도 예산 파싱"""
+    budgets = {}
+    for entry in (value or '').split(','):
+        if '=' not in entry:
+            continue
+        operation, budget = entry.split('=', 1)
+        budgets[operation.strip()] = int(budget)
+    return budgets
+
+
+def retry_after_seconds(value):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimiter:
+    """AIMD 방식의 동시 실행 수 제한
+
+    스로틀링 응답을 받으면 허용 동시 실행 수를 절반으로 줄이고(cooldown 동안 한 번만),
+    성공한 요청이 현재 한도만큼 쌓일 때마다 1씩 늘려 max_limit까지 회복합니다.
+    같은 스레드의 중첩 호출(예: 게시 중 청크 전송)은 이미 확보한 슬롯을 그대로 사용합니다.
+    """
+
+    def __init__(self, label, max_limit, min_limit=1, cooldown=5.0):
+        self.label = label
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.cooldown = cooldown
+        self.limit = self.max_limit
+        self.logger = logging.getLogger(__name__)
+        self._active = 0
+        self._successes = 0
+        self._decreased_at = 0.0
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        metrics.CONCURRENCY_LIMIT.labels(label).set(self.limit)
+
+    @contextmanager
+    def slot(self):
+        depth = getattr(self._local, 'depth', 0)
+        if depth == 0:
+            with self._condition:
+                while self._active >= self.limit:
+                    self._condition.wait()
+                self._active += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                with self._condition:
+                    self._active -= 1
+                    self._condition.notify()
+
+    def on_success(self):
+        with self._condition:
+            if self.limit >= self.max_limit:
+                return
+            self._successes += 1
+            if self._successes >= self.limit:
+                self._successes = 0
+                self.limit += 1
+                metrics.CONCURRENCY_LIMIT.labels(self.label).set(self.limit)
+                self._condition.notify()
+
+    def on_throttle(self):
+        with self._condition:
+            now = time.monotonic()
+            if now - self._decreased_at < self.cooldown:
+                return
+            self._decreased_at = now
+            self._successes = 0
+            previous = self.limit
+            self.limit = max(self.min_limit, self.limit // 2)
+            metrics.CONCURRENCY_LIMIT.labels(self.label).set(self.limit)
+        if self.limit != previous:
+            self.logger.warning(f"{self.label} is throttling requests, concurrency {previous} -> {self.limit}")
+
+
+class RequestPolicy:
+    """한 사이트(Tableau Server 또는 Cloud)에 대한 API 호출 재시도 정책
+
+    - 429, 5xx, 연결 오류만 재시도하며 지수 백오프에 지터를 더해 대기합니다.
+      응답에 Retry-After 헤더가 있으면 그 시간만큼 기다립니다.
+    - 작업(operation)별 재시도 예산이 실행 전체에서 공유되므로, 장애가 길어져도
+      재시도가 무한정 쌓이지 않습니다.
+    - limiter가 있으면 스로틀링 응답에 따라 동시 실행 수를 조절합니다.
+
+    HTTP 상태와 헤더는 install()로 requests 세션에 등록한 응답 훅에서 스레드별로 기록합니다.
+    """
+
+    def __init__(self, label, max_retries=4, base_delay=1.0, max_delay=60.0, budgets=None,
+                 default_budget=100, limiter=None):
+        self.label = label
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.default_budget = default_budget
+        self.limiter = limiter
+        self.logger = logging.getLogger(__name__)
+        self._initial_budgets = dict(budgets or {})
+        self._budgets = dict(self._initial_budgets)
+        self._budget_lock = threading.Lock()
+        self._local = threading.local()
+
+    def install(self, server):
+        """server의 requests 세션에 응답 훅 등록 (로그인/로그아웃으로 세션이 바뀔 때마다 호출)"""
+        hooks = server.session.hooks.setdefault('response', [])
+        if self._on_response not in hooks:
+            hooks.append(self._on_response)
+
+    def _on_response(self, response, *args, **kwargs):
+        if response.status_code in RETRYABLE_STATUS:
+            self._local.status = response.status_code
+            self._local.retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+        return response
+
+    def _last_response(self):
+        return getattr(self._local, 'status', None), getattr(self._local, 'retry_after', None)
+
+    def _reset_last_response(self):
+        self._local.status = None
+        self._local.retry_after = None
+
+    def is_retryable(self, error, status=None):
+        if is_auth_error(error):
+            return False
+        if status in RETRYABLE_STATUS or isinstance(error, CONNECTION_ERRORS):
+            return True
+        code = str(getattr(error, 'code', ''))
+        return code.startswith('429') or code.startswith('5')
+
+    def _take_budget(self, operation):
+        with self._budget_lock:
+            remaining = self._budgets.get(operation, self.default_budget)
+            if remaining <= 0:
+                return False
+            self._budgets[operation] = remaining - 1
+            return True
+
+    def reset_budgets(self):
+        """작업별 재시도 예산을 처음 값으로 되돌림 (daemon 모드에서 실행마다 호출)"""
+        with self._budget_lock:
+            self._budgets = dict(self._initial_budgets)
+
+    def backoff(self, attempt, retry_after=None):
+        """재시도 전 대기 시간 - Retry-After 우선, 없으면 지터를 더한 지수 백오프"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, operation, fn, max_retries=None):
+        """fn()을 실행하고 일시적인 오류는 예산 안에서 재시도"""
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            self._reset_last_response()
+            try:
+                if self.limiter is None:
+                    result = fn()
+                else:
+                    with self.limiter.slot():
+                        result = fn()
+            except Exception as e:
+                status, retry_after = self._last_response()
+                if not self.is_retryable(e, status):
+                    raise
+                if status in THROTTLE_STATUS or str(getattr(e, 'code', '')).startswith('429'):
+                    metrics.THROTTLED.labels(self.label).inc()
+                    if self.limiter is not None:
+                        self.limiter.on_throttle()
+                if attempt >= max_retries:
+                    raise
+                if not self._take_budget(operation):
+                    self.logger.warning(f"Retry budget for {operation} on {self.label} is exhausted")
+                    raise
+                delay = self.backoff(attempt, retry_after)
+                attempt += 1
+                metrics.RETRIES.labels(operation).inc()
+                self.logger.warning(
+                    f"{operation} on {self.label} failed ({status or type(e).__name__}), "
+                    f"retry {attempt}/{max_retries} in {delay:.1f}s: {str(e)}"
+                )
+                time.sleep(delay)
+                continue
+
+            if self.limiter is not None:
+                self.limiter.on_success()
+            return result
@@ -0,0 +1,237 @@
+"""마이그레이션 순서 조정 (스케줄러)
+
+선별된 데이터 원본을 파이프라인에 넘기기 전에 우선순위와 크기로 정렬하고, 실행 마감 시각이 지나면
+아직 시작하지 않은 항목을 다음 실행으로 미룹니다.
+
+- 우선순위: PRIORITY_RULES의 규칙 중 데이터 원본에 해당하는 규칙 가중치의 합 (높을수록 먼저)
+  'tag:critical=100,project:Finance/*=50,name:*KPI*=10' 형식이며, 패턴은 fnmatch 와일드카드를 사용합니다.
+  project 규칙은 원본 프로젝트의 전체 경로(상위/하위)와 비교합니다.
+- 크기 순서: 같은 우선순위 안에서 small-first는 작은 항목부터, largest-first는 큰 항목부터 처리합니다.
+  largest-first는 워커가 비는 대로 다음 항목을 가져가는 파이프라인에서 전체 소요 시간(makespan)을 줄입니다.
+  크기를 알 수 없는 항목은 두 순서 모두에서 크기를 아는 항목 뒤에 둡니다.
+- 정렬하려면 선별 결과 전체가 필요하므로, 순서를 바꾸지 않는 경우(listed, 규칙 없음)에만 목록 조회와
+  마이그레이션이 겹쳐 진행됩니다.
+- 통합 문서와 흐름은 DependencyGate가 연결된 상위 데이터 원본의 마이그레이션이 끝날 때까지 붙잡아 둡니다.
+"""
+import fnmatch
+import logging
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+ORDERS = ('listed', 'small-first', 'largest-first')
+RULE_KINDS = ('tag', 'project', 'name')
+
+PriorityRule = namedtuple('PriorityRule', ['kind', 'pattern', 'weight'])
+
+
+def parse_priority_rules(value):
+    """'tag:critical=100,project:Finance/*=50' 형식의 우선순위 규칙 파싱"""
+    rules = []
+    for entry in (value or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        if ':' not in entry or '=' not in entry:
+            raise ValueError(f"Priority rule must look like kind:pattern=weight: {entry}")
+        kind, rest = entry.split(':', 1)
+        pattern, weight = rest.rsplit('=', 1)
+        kind = kind.strip().lower()
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Unknown priority rule kind '{kind}' (expected one of {', '.join(RULE_KINDS)})")
+        rules.append(PriorityRule(kind, pattern.strip(), int(weight)))
+    return rules
+
+
+def run_deadline(started_at, minutes):
+    """실행 시작 시각 기준 마감 시각 (minutes가 0이면 None)"""
+    if not minutes:
+        return None
+    return started_at + timedelta(minutes=minutes)
+
+
+class MigrationScheduler:
+    """마이그레이션 대상의 처리 순서와 실행 마감 시각 관리
+
+    size_fn(item)은 항목 크기(바이트, 모르면 None)를, project_path_fn(item)은 원본 프로젝트 경로를 반환합니다.
+    on_defer(item)는 마감 시각이 지나 시작하지 못한 항목마다 호출됩니다.
+    """
+
+    def __init__(self, order='listed', rules=(), deadline=None, size_fn=None, project_path_fn=None,
+                 on_defer=None):
+        if order not in ORDERS:
+            raise ValueError(f"Unknown schedule order '{order}' (expected one of {', '.join(ORDERS)})")
+        self.order = order
+        self.rules = list(rules)
+        self.deadline = deadline
+        self.size_fn = size_fn
+        self.project_path_fn = project_path_fn
+        self.on_defer = on_defer
+        self.deferred = 0
+        self.logger = logging.getLogger(__name__)
+
+    def reorders(self):
+        """선별 결과 전체를 모아 정렬해야 하는지 여부"""
+        return self.order != 'listed' or bool(self.rules)
+
+    def _matches(self, rule, item):
+        if rule.kind == 'name':
+            return fnmatch.fnmatchcase(item.name or '', rule.pattern)
+        if rule.kind == 'tag':
+            return any(fnmatch.fnmatchcase(tag, rule.pattern) for tag in (getattr(item, 'tags', None) or ()))
+        path = self.project_path_fn(item) if self.project_path_fn else getattr(item, 'project_name', None)
+        return fnmatch.fnmatchcase(path or '', rule.pattern)
+
+    def priority(self, item):
+        return sum(rule.weight for rule in self.rules if self._matches(rule, item))
+
+    def sort(self, items):
+        """우선순위와 크기 순서로 정렬한 목록 반환 (같은 키는 목록 순서 유지)"""
+        def key(item):
+            priority = -self.priority(item)
+            if self.order == 'listed':
+                return (priority,)
+            size = self.size_fn(item) if self.size_fn else None
+            if size is None:
+                return (priority, 1, 0)
+            return (priority, 0, -size if self.order == 'largest-first' else size)
+
+        return sorted(items, key=key)
+
+    def expired(self):
+        return self.deadline is not None and datetime.now(timezone.utc) >= self.deadline
+
+    def schedule(self, items):
+        """정렬된 순서로 항목을 하나씩 반환하는 제너레이터
+
+        마감 시각 이후에 다음 항목을 요청받으면 남은 항목을 모두 on_defer로 넘기고 끝냅니다.
+        """
+        if self.reorders():
+            items = self.sort(items)
+            self.logger.info(f"Scheduled {len(items)} items ({self.order}, {len(self.rules)} priority rules)")
+
+        source = iter(items)
+        for item in source:
+            if self.expired():
+                self.defer(item)
+                for remaining in source:
+                    self.defer(remaining)
+                self.logger.warning(f"Run deadline reached, deferred {self.deferred} items to the next run")
+                return
+            yield item
+
+    def defer(self, item):
+        """마감 시각이 지나 시작하지 못한 항목 기록"""
+        self.deferred += 1
+        if self.on_defer:
+            self.on_defer(item)
+
+
+# 상위 항목의 결과 중 하위 항목을 진행해도 되는 상태 (대상에 상위 항목의 최신 버전이 있음)
+UPSTREAM_DONE = ('success', 'unchanged')
+
+
+class DependencyGate:
+    """상위 항목(연결된 게시 데이터 원본)의 마이그레이션이 끝난 뒤에 하위 항목을 내보내는 관문
+
+    upstream_fn(item)은 항목이 의존하는 상위 항목 ID 집합을, status_fn(item_id)는 이번 실행에서의 상태
+    (MigrationResults 상태, 이번 실행 대상이 아니면 None)를 반환합니다.
+
+    - 상위 항목이 모두 끝났거나 이번 실행 대상이 아니면 받는 즉시 내보내므로, 의존 관계가 없는 항목은
+      기다리지 않고 병렬로 처리됩니다.
+    - 상위 항목이 아직 pending이면 대기 목록에 두고, notify()가 호출될 때(항목 결과가 나올 때마다) 다시 확인합니다.
+      대기 중인 항목은 자기 상위 항목만 기다리며 다른 항목의 진행을 막지 않습니다.
+    - 상위 항목이 건너뛰어졌으면(skipped - 매핑 대상 아님 등) 하위 항목은 on_skipped(item, upstream_id)로,
+      실패했거나 미뤄지면 on_blocked(item, upstream_id)로 넘기고 실행하지 않습니다.
+      이미 대상에 최신 버전이 있어 건너뛴 상위 항목은 status_fn이 unchanged로 반환해야 합니다.
+    - expired()가 참이 된 뒤에 풀려난 대기 항목은 on_defer(item)로 넘깁니다.
+    """
+
+    def __init__(self, upstream_fn, status_fn, on_blocked=None, on_skipped=None, expired=None, on_defer=None,
+                 poll_interval=1.0):
+        self.upstream_fn = upstream_fn
+        self.status_fn = status_fn
+        self.on_blocked = on_blocked
+        self.on_skipped = on_skipped
+        self.expired = expired
+        self.on_defer = on_defer
+        self.poll_interval = poll_interval
+        self.blocked = 0
+        self.skipped = 0
+        self.logger = logging.getLogger(__name__)
+        self._condition = threading.Condition()
+        self._version = 0
+
+    def notify(self):
+        """항목 결과가 기록될 때마다 호출 - 대기 중인 항목을 다시 확인"""
+        with self._condition:
+            self._version += 1
+            self._condition.notify_all()
+
+    def _check(self, item):
+        """('ready' | 'wait' | 'skipped' | 'blocked', 막은 상위 항목 ID)"""
+        waiting_on = None
+        for upstream_id in self.upstream_fn(item) or ():
+            status = self.status_fn(upstream_id)
+            if status is None or status in UPSTREAM_DONE:
+                continue
+            if status == 'skipped':
+                return 'skipped', upstream_id
+            if status != 'pending':
+                return 'blocked', upstream_id
+            waiting_on = upstream_id
+        return ('wait', waiting_on) if waiting_on else ('ready', None)
+
+    def _release(self, waiting):
+        """대기 목록에서 진행할 수 있게 된 항목을 꺼내 반환 (건너뛸/차단된 항목은 on_skipped/on_blocked로 처리)"""
+        ready = []
+        for item in list(waiting):
+            state, upstream_id = self._check(item)
+            if state == 'wait':
+                continue
+            waiting.remove(item)
+            if state in ('skipped', 'blocked'):
+                self._hold(item, state, upstream_id)
+            elif self.expired and self.expired():
+                if self.on_defer:
+                    self.on_defer(item)
+            else:
+                ready.append(item)
+        return ready
+
+    def _hold(self, item, state, upstream_id):
+        """상위 항목이 대상에 없어 하위 항목을 실행하지 않음"""
+        if state == 'skipped':
+            self.skipped += 1
+            self.logger.warning(f"Skipping {item.name}: upstream {upstream_id} was skipped")
+            callback = self.on_skipped
+        else:
+            self.blocked += 1
+            self.logger.warning(f"Not migrating {item.name}: upstream {upstream_id} was not migrated")
+            callback = self.on_blocked
+        if callback:
+            callback(item, upstream_id)
+
+    def release(self, items):
+        """상위 항목이 끝난 순서대로 항목을 하나씩 반환하는 제너레이터"""
+        waiting = []
+        for item in items:
+            yield from self._release(waiting)
+            state, upstream_id = self._check(item)
+            if state == 'ready':
+                yield item
+            elif state == 'wait':
+                waiting.append(item)
+            else:
+                self._hold(item, state, upstream_id)
+
+        while waiting:
+            with self._condition:
+                version = self._version
+            ready = self._release(waiting)
+            if ready:
+                yield from ready
+                continue
+            with self._condition:
+                if self._version == version:
+                    self._condition.wait(self.poll_interval)
@@ -0,0 +1,152 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import tableauserverclient as TSC
+
+import metrics
+
+
+def is_auth_error(error):
+    """인증 토큰 만료/무효(401) 오류 여부"""
+    if isinstance(error, TSC.NotSignedInError):
+        return True
+    return str(getattr(error, 'code', '')).startswith('401')
+
+
+class TableauSessionPool:
+    """한 사이트에 대해 로그인된 TSC.Server 객체를 재사용하는 세션 풀
+
+    세션은 필요할 때 최대 size개까지 생성되며 실행이 끝날 때까지 로그인 상태로 유지됩니다.
+    한 세션은 한 번에 하나의 작업에만 대여되므로 여러 워커가 동시에 사용해도 안전합니다.
+    policy(RequestPolicy)가 있으면 run()의 일시적인 오류를 재시도하고 동시 실행 수를 조절합니다.
+    """
+
+    def __init__(self, conf, label, size=1, token_ttl=None, policy=None):
+        self.conf = conf
+        self.label = label
+        self.size = max(1, size)
+        self.token_ttl = token_ttl
+        self.policy = policy
+        self.logger = logging.getLogger(__name__)
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._signed_in_at = {}
+
+    def _sign_in(self, server):
+        auth = TSC.PersonalAccessTokenAuth(
+            token_name=self.conf['pat_name'],
+            personal_access_token=self.conf['pat_secret'],
+            site_id=self.conf['site']
+        )
+        # 로그아웃하면 requests 세션이 새로 만들어지므로 로그인할 때마다 응답 훅을 다시 등록
+        if self.policy is not None:
+            self.policy.install(server)
+        # sign_in은 PAT 인증도 처리하며, 서버 버전 확인 전(기본 2.4)에도 호출할 수 있음
+        with metrics.SIGN_IN_SECONDS.labels(self.label).time():
+            server.auth.sign_in(auth)
+        self._signed_in_at[id(server)] = time.monotonic()
+        self.logger.info(f"Successfully connected to {self.label}")
+
+    def _new_server(self):
+        server = TSC.Server(self.conf['url'], use_server_version=True)
+        self._sign_in(server)
+        return server
+
+    def reauthenticate(self, server):
+        """만료된 세션 재로그인"""
+        self.logger.info(f"Re-authenticating session to {self.label}")
+        metrics.REAUTHENTICATIONS.labels(self.label).inc()
+        try:
+            server.auth.sign_out()
+        except Exception:
+            # 이미 만료된 토큰은 로그아웃도 실패할 수 있음
+            pass
+        self._sign_in(server)
+
+    def _expired(self, server):
+        if not self.token_ttl:
+            return False
+        signed_in_at = self._signed_in_at.get(id(server), 0)
+        return time.monotonic() - signed_in_at >= self.token_ttl
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if not can_create:
+            return self._idle.get()
+
+        try:
+            return self._new_server()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    @contextmanager
+    def session(self):
+        """로그인된 세션을 대여하고 사용 후 반납"""
+        try:
+            server = self._acquire()
+        except Exception as e:
+            self.logger.error(f"Failed to connect to {self.label}: {str(e)}")
+            raise
+
+        try:
+            if self._expired(server):
+                self.reauthenticate(server)
+            yield server
+        except Exception as e:
+            # 다음 사용자가 만료된 세션을 받지 않도록 반납 전에 재로그인
+            if is_auth_error(e):
+                try:
+                    self.reauthenticate(server)
+                except Exception as auth_error:
+                    self.logger.error(f"Failed to re-authenticate to {self.label}: {str(auth_error)}")
+            raise
+        finally:
+            self._idle.put(server)
+
+    def run(self, fn, operation='request'):
+        """세션으로 fn(server)를 실행하고, 인증 오류 시 재로그인 후 한 번 더 시도
+
+        policy가 있으면 일시적인 오류(429, 5xx, 연결 오류)는 operation의 재시도 예산 안에서 다시 실행합니다.
+        """
+        if self.policy is None:
+            return self._run(fn)
+        return self.policy.call(operation, lambda: self._run(fn))
+
+    def _run(self, fn):
+        with self.session() as server:
+            try:
+                return fn(server)
+            except Exception as e:
+                if not is_auth_error(e):
+                    raise
+                self.reauthenticate(server)
+                return fn(server)
+
+    def close(self):
+        """풀의 모든 세션 로그아웃"""
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                server.auth.sign_out()
+            except Exception as e:
+                self.logger.warning(f"Failed to sign out from {self.label}: {str(e)}")
+        with self._lock:
+            self._created = 0
+        self._signed_in_at.clear()
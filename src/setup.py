@@ -5,7 +5,7 @@ setup(
     version="1.0.0",
     packages=find_packages(),
     install_requires=[
-        'tableauserverclient>=0.17.0',
+        'tableauserverclient>=0.25',
         'python-dotenv>=0.19.0',
         'tqdm>=4.65.0',
         'prometheus_client>=0.17.0',
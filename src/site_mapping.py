@@ -0,0 +1,109 @@
+"""사이트/프로젝트 매핑 설정
+
+여러 원본 사이트를 한 번에 마이그레이션할 때 사용하는 JSON 설정 파일을 읽습니다.
+
+    {
+      "sites": [
+        {
+          "source_site": "finance",
+          "target_site": "finance-cloud",
+          "target_pat_name": "finance-migration",
+          "target_pat_secret_env": "FINANCE_TC_PAT_SECRET",
+          "projects": [
+            {"source": "Finance/Reports", "target": "Migrated/Finance Reports"},
+            {"source": "*", "target": "Migrated/Other"}
+          ]
+        }
+      ]
+    }
+
+- source 프로젝트의 하위 프로젝트는 target 경로 아래에 같은 계층 구조로 만들어집니다.
+- 여러 매핑에 해당하면 가장 구체적인(경로가 긴) source 매핑을 사용하며, "*"는 사이트 전체를 뜻합니다.
+- 매핑에 해당하지 않는 프로젝트의 콘텐츠는 마이그레이션하지 않습니다.
+- PAT 비밀 값은 파일에 직접 쓰지 않고 *_pat_secret_env로 환경 변수 이름을 지정합니다.
+  생략하면 properties.env의 TS_/TC_ 값을 사용합니다.
+"""
+import json
+import os
+from collections import namedtuple
+
+from project_cache import split_path, join_path
+
+ProjectMapping = namedtuple('ProjectMapping', ['source', 'target'])
+SiteMapping = namedtuple('SiteMapping', ['source_site', 'target_site', 'projects', 'source_auth', 'target_auth'])
+
+ALL_PROJECTS = '*'
+
+
+def _auth(entry, prefix):
+    """사이트별 PAT 설정 - 값이 없으면 기본 설정을 사용하도록 None"""
+    name = entry.get(f'{prefix}_pat_name')
+    secret_env = entry.get(f'{prefix}_pat_secret_env')
+    if secret_env and not os.getenv(secret_env):
+        raise ValueError(f"Environment variable {secret_env} for {entry.get(f'{prefix}_site')} is not set")
+    secret = os.getenv(secret_env) if secret_env else None
+    if not name and not secret:
+        return None
+    return {'pat_name': name, 'pat_secret': secret}
+
+
+def load_site_mappings(path):
+    """매핑 설정 파일을 읽어 SiteMapping 목록 반환"""
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+
+    mappings = []
+    for entry in document.get('sites', []):
+        if 'source_site' not in entry or 'target_site' not in entry:
+            raise ValueError(f"Site mapping requires source_site and target_site: {entry}")
+        projects = [ProjectMapping(p['source'], p['target']) for p in entry.get('projects', [])]
+        if not projects:
+            raise ValueError(f"Site mapping for {entry['source_site']} has no project mappings")
+        mappings.append(SiteMapping(
+            source_site=entry['source_site'],
+            target_site=entry['target_site'],
+            projects=projects,
+            source_auth=_auth(entry, 'source'),
+            target_auth=_auth(entry, 'target')
+        ))
+
+    sources = [mapping.source_site for mapping in mappings]
+    if len(set(sources)) != len(sources):
+        raise ValueError("Each source_site may appear only once in the site mapping")
+    return mappings
+
+
+class ProjectMapper:
+    """원본 프로젝트를 대상 프로젝트 경로로 변환
+
+    source_paths는 원본 사이트의 프로젝트 ID별 전체 경로(project_cache.project_paths)입니다.
+    """
+
+    def __init__(self, mappings, source_paths):
+        # 구체적인 매핑부터 비교 ("*"는 마지막)
+        self.mappings = sorted(
+            mappings,
+            key=lambda m: -1 if m.source == ALL_PROJECTS else len(split_path(m.source)),
+            reverse=True
+        )
+        self.source_paths = source_paths
+        self._targets = {project_id: self._resolve(path) for project_id, path in source_paths.items()}
+
+    def _resolve(self, source_path):
+        parts = split_path(source_path)
+        for mapping in self.mappings:
+            if mapping.source == ALL_PROJECTS:
+                return join_path(split_path(mapping.target) + parts)
+            prefix = split_path(mapping.source)
+            if parts[:len(prefix)] == prefix:
+                # 매핑된 프로젝트 자신은 target 경로, 하위 프로젝트는 그 아래에 같은 구조로
+                return join_path(split_path(mapping.target) + parts[len(prefix):])
+        return None
+
+    def target_path(self, source_project_id):
+        """원본 프로젝트의 대상 경로 (매핑되지 않으면 None)"""
+        return self._targets.get(source_project_id)
+
+    def required_paths(self):
+        """마이그레이션에 필요한 모든 대상 프로젝트 경로"""
+        return {path for path in self._targets.values() if path}
@@ -0,0 +1,259 @@
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+
+def to_timestamp(value):
+    """datetime을 저장용 UTC ISO 문자열로 변환"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def from_timestamp(value):
+    """저장된 UTC ISO 문자열을 datetime으로 변환"""
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+
+
+class MigrationStateStore:
+    """데이터 원본별 마이그레이션 상태와 실행 이력을 저장하는 SQLite 저장소
+
+    - runs: 실행 단위 이력 (running / completed / interrupted / failed)
+    - datasources: 원본 콘텐츠 ID별 마지막 결과, 마이그레이션된 updated_at, Cloud 콘텐츠 ID,
+      마지막으로 게시한 파일의 지문(SHA-256)과 크기, 다운로드/업로드 소요 시간(계획 모드의 예상 시간 계산용),
+      마지막으로 게시한 위치(target - 'Cloud 사이트/프로젝트 ID')
+      통합 문서와 흐름도 같은 테이블에 content_type과 함께 기록합니다 (Tableau ID는 유형 간에도 고유).
+    - upload_sessions: 진행 중인 청크 업로드 세션과 서버에 전송이 끝난 바이트 수 (이어서 업로드용)
+
+    outcome이 'skipped'(내용 변경 없음)인 항목도 대상이 최신이므로 성공과 같이 취급합니다.
+    마이그레이션된 버전과 지문은 같은 위치에 게시할 때만 비교하며, 위치가 기록되지 않은 이전 버전의 항목은
+    위치가 다른 것으로 봅니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    mode TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT,
+                    status TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS datasources (
+                    source_id TEXT PRIMARY KEY,
+                    name TEXT,
+                    source_updated_at TEXT,
+                    migrated_updated_at TEXT,
+                    target_id TEXT,
+                    outcome TEXT,
+                    error TEXT,
+                    run_id INTEGER,
+                    recorded_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS upload_sessions (
+                    resume_key TEXT PRIMARY KEY,
+                    upload_id TEXT NOT NULL,
+                    committed_bytes INTEGER NOT NULL,
+                    fingerprint TEXT,
+                    updated_at TEXT
+                );
+            """)
+            self._ensure_columns('datasources', {
+                'fingerprint': 'TEXT',
+                'bytes': 'INTEGER',
+                'download_seconds': 'REAL',
+                'upload_seconds': 'REAL',
+                'content_type': "TEXT DEFAULT 'datasource'",
+                'target': 'TEXT'
+            })
+
+    def _ensure_columns(self, table, columns):
+        """이전 버전에서 만든 저장소에 새 컬럼 추가"""
+        existing = {row['name'] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        for name, column_type in columns.items():
+            if name not in existing:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def start_run(self, mode, resume=False):
+        """실행 시작 기록 - resume이면 같은 모드의 중단된 실행을 이어서 사용"""
+        with self._lock, self._conn:
+            if resume:
+                row = self._conn.execute(
+                    "SELECT run_id, status FROM runs WHERE mode = ? ORDER BY run_id DESC LIMIT 1",
+                    (mode,)
+                ).fetchone()
+                if row and row['status'] != 'completed':
+                    self._conn.execute(
+                        "UPDATE runs SET status = 'running', finished_at = NULL WHERE run_id = ?",
+                        (row['run_id'],)
+                    )
+                    return row['run_id'], True
+
+            cursor = self._conn.execute(
+                "INSERT INTO runs (mode, started_at, status) VALUES (?, ?, 'running')",
+                (mode, to_timestamp(datetime.now(timezone.utc)))
+            )
+            return cursor.lastrowid, False
+
+    def finish_run(self, run_id, status='completed'):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, finished_at = ? WHERE run_id = ?",
+                (status, to_timestamp(datetime.now(timezone.utc)), run_id)
+            )
+
+    def watermark(self):
+        """다음 증분 실행의 기준 시각
+
+        마지막으로 완료된 실행의 시작 시각과, 아직 성공하지 못한 데이터 원본의 updated_at 중
+        더 이른 시각을 반환합니다. 완료된 실행이 없으면 None을 반환합니다.
+
+        실패한 항목은 다음 실행에서 다시 선별되어 그 실행 ID로 다시 기록되므로, 마지막 완료 실행보다
+        이전 실행에 머물러 있는 실패 기록은 Server에서 삭제되었거나 선별 범위에서 빠진 항목입니다.
+        이런 기록은 기준 시각을 과거에 묶어 두지 않도록 제외합니다.
+        """
+        with self._lock:
+            run = self._conn.execute(
+                "SELECT run_id, started_at FROM runs WHERE status = 'completed' ORDER BY run_id DESC LIMIT 1"
+            ).fetchone()
+            if not run:
+                return None
+            pending = self._conn.execute(
+                "SELECT MIN(source_updated_at) AS oldest FROM datasources "
+                "WHERE outcome NOT IN ('success', 'skipped') AND source_updated_at IS NOT NULL "
+                "AND run_id >= ?",
+                (run['run_id'],)
+            ).fetchone()
+
+        candidates = [from_timestamp(run['started_at'])]
+        if pending and pending['oldest']:
+            candidates.append(from_timestamp(pending['oldest']))
+        return min(candidates)
+
+    def is_up_to_date(self, source_id, updated_at, target=None):
+        """updated_at 버전이 이미 마이그레이션되었는지 여부 (target이 주어지면 같은 위치에 게시된 경우만)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT migrated_updated_at, target FROM datasources WHERE source_id = ?",
+                (source_id,)
+            ).fetchone()
+        if row and target is not None and row['target'] != target:
+            return False
+        migrated = from_timestamp(row['migrated_updated_at']) if row else None
+        return migrated is not None and updated_at is not None and migrated >= updated_at
+
+    def completed_in_run(self, run_id):
+        """해당 실행에서 이미 성공한 원본 데이터 원본 ID 집합"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source_id FROM datasources WHERE run_id = ? AND outcome IN ('success', 'skipped')",
+                (run_id,)
+            ).fetchall()
+        return {row['source_id'] for row in rows}
+
+    def fingerprint(self, source_id, target=None):
+        """마지막으로 게시에 성공한 파일의 지문 (target이 주어지면 같은 위치에 게시한 경우만, 아니면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, target FROM datasources WHERE source_id = ?",
+                (source_id,)
+            ).fetchone()
+        if not row or (target is not None and row['target'] != target):
+            return None
+        return row['fingerprint']
+
+    def record(self, run_id, source_id, name, updated_at, outcome, target_id=None, error=None,
+               fingerprint=None, size=None, download_seconds=None, upload_seconds=None, content_type='datasource',
+               target=None):
+        """콘텐츠 처리 결과 기록 - 성공한 경우에만 마이그레이션된 버전, 대상 ID, 지문, 게시 위치, 전송 시간을 갱신"""
+        updated = to_timestamp(updated_at)
+        now = to_timestamp(datetime.now(timezone.utc))
+        success = outcome in ('success', 'skipped')
+        if not success:
+            fingerprint = size = download_seconds = upload_seconds = target = None
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO datasources (source_id, name, source_updated_at, migrated_updated_at,
+                                         target_id, outcome, error, run_id, recorded_at,
+                                         fingerprint, bytes, download_seconds, upload_seconds, content_type,
+                                         target)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(source_id) DO UPDATE SET
+                    name = excluded.name,
+                    content_type = excluded.content_type,
+                    source_updated_at = excluded.source_updated_at,
+                    migrated_updated_at = CASE WHEN ? THEN excluded.migrated_updated_at
+                                               ELSE datasources.migrated_updated_at END,
+                    target_id = COALESCE(excluded.target_id, datasources.target_id),
+                    outcome = excluded.outcome,
+                    error = excluded.error,
+                    run_id = excluded.run_id,
+                    recorded_at = excluded.recorded_at,
+                    fingerprint = COALESCE(excluded.fingerprint, datasources.fingerprint),
+                    bytes = COALESCE(excluded.bytes, datasources.bytes),
+                    download_seconds = COALESCE(excluded.download_seconds, datasources.download_seconds),
+                    upload_seconds = COALESCE(excluded.upload_seconds, datasources.upload_seconds),
+                    target = COALESCE(excluded.target, datasources.target)
+            """, (source_id, name, updated, updated if success else None, target_id,
+                  outcome, error, run_id, now, fingerprint, size, download_seconds, upload_seconds, content_type,
+                  target, success))
+
+    def transfer_history(self, source_id):
+        """마지막으로 측정된 전송 기록 (bytes, download_seconds, upload_seconds) - 없으면 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT bytes, download_seconds, upload_seconds FROM datasources WHERE source_id = ?",
+                (source_id,)
+            ).fetchone()
+        if not row or row['bytes'] is None:
+            return None
+        return dict(row)
+
+    def transfer_stats(self):
+        """다운로드/업로드 시간이 모두 측정된 항목의 합계 (count, bytes, download_seconds, upload_seconds)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS count, SUM(bytes) AS bytes, SUM(download_seconds) AS download_seconds, "
+                "SUM(upload_seconds) AS upload_seconds FROM datasources "
+                "WHERE bytes IS NOT NULL AND download_seconds IS NOT NULL AND upload_seconds IS NOT NULL"
+            ).fetchone()
+        return dict(row)
+
+    def upload_session(self, resume_key):
+        """이어서 업로드할 수 있는 세션 정보 (upload_id, committed_bytes, fingerprint)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT upload_id, committed_bytes, fingerprint FROM upload_sessions WHERE resume_key = ?",
+                (resume_key,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def save_upload_session(self, resume_key, upload_id, committed_bytes, fingerprint=None):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO upload_sessions (resume_key, upload_id, committed_bytes, fingerprint, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(resume_key) DO UPDATE SET
+                    upload_id = excluded.upload_id,
+                    committed_bytes = excluded.committed_bytes,
+                    fingerprint = excluded.fingerprint,
+                    updated_at = excluded.updated_at
+            """, (resume_key, upload_id, committed_bytes, fingerprint,
+                  to_timestamp(datetime.now(timezone.utc))))
+
+    def clear_upload_session(self, resume_key):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM upload_sessions WHERE resume_key = ?", (resume_key,))
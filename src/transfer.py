@@ -0,0 +1,137 @@
+import hashlib
+import os
+import queue
+import threading
+from collections import namedtuple
+from contextlib import closing
+from email.message import Message
+
+from content_types import CONTENT_TYPES
+
+# 다운로드된 파일 경로, 내용 SHA-256 지문, 바이트 수
+DownloadedFile = namedtuple('DownloadedFile', ['path', 'fingerprint', 'size'])
+# 디스크를 거치지 않고 Cloud 업로드 세션으로 바로 보낸 내용 - 게시(commit)만 남은 상태
+StreamedUpload = namedtuple('StreamedUpload', ['upload_id', 'file_extension', 'fingerprint', 'size'])
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _content_url(server, content_type, content_id, include_extract):
+    """콘텐츠 다운로드 URL과 기본 확장자 - 추출을 제외할 수 있는 유형만 includeExtract를 지정"""
+    spec = CONTENT_TYPES[content_type]
+    url = f"{getattr(server, spec.endpoint).baseurl}/{content_id}/content"
+    if spec.include_extract and not include_extract:
+        url += "?includeExtract=False"
+    return url, spec.default_extension
+
+
+def _response_extension(response, default='.tdsx'):
+    """Content-Disposition 헤더의 파일명에서 확장자 추출"""
+    message = Message()
+    message['Content-Disposition'] = response.headers.get('Content-Disposition', '')
+    filename = message.get_filename(failobj='')
+    return os.path.splitext(filename)[1] or default
+
+
+def download_with_fingerprint(server, content_id, download_path, base_name,
+                              include_extract=True, chunk_size=DOWNLOAD_CHUNK_SIZE, content_type='datasource'):
+    """콘텐츠(데이터 원본/통합 문서/흐름) 내용을 스트리밍으로 받아 파일에 쓰면서 SHA-256 지문을 함께 계산
+
+    server.datasources.download와 같은 REST 엔드포인트를 사용하되, 응답 본문을 청크 단위로
+    파일에 쓰는 동안 해시를 갱신하므로 파일을 다시 읽지 않고 지문을 얻을 수 있습니다.
+    저장된 파일의 정확한 경로를 반환하므로 다운로드 폴더를 다시 검색할 필요가 없습니다.
+    """
+    url, default_extension = _content_url(server, content_type, content_id, include_extract)
+    endpoint = getattr(server, CONTENT_TYPES[content_type].endpoint)
+
+    digest = hashlib.sha256()
+    size = 0
+    with closing(endpoint.get_request(url, parameters={'stream': True})) as response:
+        file_path = os.path.join(download_path, base_name + _response_extension(response, default_extension))
+        with open(file_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size):
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+
+    return DownloadedFile(file_path, digest.hexdigest(), size)
+
+
+class StreamingNotPossible(Exception):
+    """대상 업로드 세션으로 스트리밍할 수 없는 경우 - 호출자는 디스크 경유 전송으로 전환"""
+
+
+def stream_to_upload_session(source, target, publisher, content_id, label,
+                             chunk_size, buffer_chunks=2, include_extract=True, content_type='datasource'):
+    """Server 다운로드 응답 본문을 디스크에 쓰지 않고 Cloud 업로드 세션에 청크 단위로 전송
+
+    읽기 스레드가 응답을 chunk_size 블록으로 모아 최대 buffer_chunks개까지 큐에 쌓고,
+    호출 스레드가 이를 업로드 세션에 append합니다. 따라서 다운로드와 업로드가 겹쳐 진행되며
+    항목당 메모리 사용량은 약 (buffer_chunks + 2) x chunk_size로 제한됩니다.
+
+    다운로드 오류는 그대로 전달하고, 업로드 세션 쪽 오류는 StreamingNotPossible로 감싸서 전달합니다.
+    """
+    url, default_extension = _content_url(source, content_type, content_id, include_extract)
+    endpoint = getattr(source, CONTENT_TYPES[content_type].endpoint)
+
+    try:
+        upload_id = target.fileuploads.initiate()
+    except Exception as e:
+        raise StreamingNotPossible(f"Could not start upload session: {str(e)}") from e
+
+    buffers = queue.Queue(maxsize=max(1, buffer_chunks))
+    stop = threading.Event()
+    digest = hashlib.sha256()
+    state = {'size': 0, 'error': None}
+
+    def put(block):
+        # 업로드 쪽이 중단되면 큐가 비워지지 않으므로 stop을 확인하며 대기
+        while not stop.is_set():
+            try:
+                buffers.put(block, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    with closing(endpoint.get_request(url, parameters={'stream': True})) as response:
+        file_extension = _response_extension(response, default_extension)[1:]
+
+        def read_response():
+            pending = bytearray()
+            try:
+                for data in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    if stop.is_set():
+                        return
+                    digest.update(data)
+                    state['size'] += len(data)
+                    pending += data
+                    if len(pending) >= chunk_size:
+                        if not put(bytes(pending[:chunk_size])):
+                            return
+                        del pending[:chunk_size]
+                if pending:
+                    put(bytes(pending))
+            except Exception as e:
+                state['error'] = e
+            finally:
+                put(None)
+
+        reader = threading.Thread(target=read_response, name=f"stream-{content_id}", daemon=True)
+        reader.start()
+        try:
+            while True:
+                block = buffers.get()
+                if block is None:
+                    break
+                try:
+                    publisher.append_chunk(target, upload_id, block, label)
+                except Exception as e:
+                    raise StreamingNotPossible(f"Upload session append failed: {str(e)}") from e
+        finally:
+            stop.set()
+            reader.join()
+
+    if state['error'] is not None:
+        raise state['error']
+    return StreamedUpload(upload_id, file_extension, digest.hexdigest(), state['size'])